@@ -13,19 +13,28 @@ Key Features:
 """
 
 import asyncio
+import inspect
 import logging
 import json
+import threading
 import time
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 import sys
+try:
+    import uvloop
+except ImportError:
+    # uvloop is not available on Windows
+    uvloop = None
 
 from mcp.server.fastmcp import FastMCP, Context
 
-from synapse.models import ConversationRecord
 from synapse.storage.paths import StoragePaths
-from synapse.storage.initializer import StorageInitializer, initialize_synapse_storage
+from synapse.storage.initializer import (
+    StorageInitializer, initialize_synapse_storage, _default_metadata, _load_or_default
+)
 from synapse.storage.file_manager import FileManager
 from synapse.utils.logging_config import setup_logging
 from synapse.tools.save_conversation import SaveConversationTool
@@ -35,45 +44,76 @@ from synapse.tools.extract_solutions import ExtractSolutionsTool
 
 logger = logging.getLogger(__name__)
 
-# Mock Database class for demonstration purposes
-class Database:
-    """Mock database class for demonstration purposes"""
-    
-    @classmethod
-    async def connect(cls) -> "Database":
-        """Connect to database"""
-        logger.info("Database connection established")
-        return cls()
-    
-    async def disconnect(self) -> None:
-        """Disconnect from database"""
-        logger.info("Database connection closed")
+# 工具参数的合法取值，模块加载时构建一次
+_EXTRACT_TYPES = frozenset(("code", "approach", "pattern", "all"))
+_MERGE_MODES = frozenset(("append", "overwrite"))
+
+# 工具失败响应的固定字段，出错时复制后只更新与本次请求相关的字段
+# （模板中只放不可变值，列表/字典等可变字段在每次响应中单独创建）
+_SAVE_ERROR_TEMPLATE = {
+    "success": False,
+    "error": None,
+    "error_type": None,
+    "conversation": None,
+}
+_SEARCH_ERROR_TEMPLATE = {
+    "query": None,
+    "total_found": 0,
+    "search_area": None,
+    "error": None,
+    "processing_time_ms": 0,
+}
+_INJECT_ERROR_TEMPLATE = {
+    "injection_summary": None,
+    "total_items": 0,
+    "query": None,
+    "processing_time_ms": 0,
+    "error": None,
+}
+_EXTRACT_ERROR_TEMPLATE = {
+    "success": False,
+    "error": None,
+    "error_type": None,
+    "total_extracted": 0,
+    "conversations_processed": 0,
+    "extraction_summary": None,
+    "processing_time_ms": 0,
+    "extracted_at": None,
+    "extraction_engine": "synapse_solution_extractor_v1.0",
+}
+
+# 缓存最近一次格式化的整秒时间前缀，同一秒内的多次调用只需拼接微秒部分
+_iso_second_cache = (-1, "")
+
+
+def _fast_iso(t: Optional[float] = None) -> str:
+    """
+    生成本地时间的ISO格式时间戳（供响应字典中的机器可读字段使用）
     
-    async def save_conversation(self, conversation: ConversationRecord) -> str:
-        """Save conversation record (mock implementation)"""
-        logger.info(f"Saving conversation: {conversation.id}")
-        return conversation.id
+    输出格式与 datetime.now().isoformat() 一致（YYYY-MM-DDTHH:MM:SS.ffffff），
+    但基于 time.time() 并按秒缓存 strftime 结果，避免每次构造 datetime 对象。
     
-    async def search_conversations(self, query: str, limit: int = 10) -> list:
-        """Search conversation records (mock implementation)"""
-        logger.info(f"Search query: '{query}', limit: {limit}")
-        return [
-            {
-                "id": "conv_20240115_001",
-                "title": f"Solution for '{query}'",
-                "snippet": f"This is a detailed explanation and code example for {query}...",
-                "match_score": 0.95,
-                "created_at": "2024-01-15T10:30:00Z",
-                "tags": [query.lower(), "programming"],
-                "type": "conversation"
-            }
-        ]
+    Args:
+        t: Unix时间戳，为None时使用当前时间
+        
+    Returns:
+        str: ISO格式的本地时间字符串
+    """
+    global _iso_second_cache
+    if t is None:
+        t = time.time()
+    seconds = int(t)
+    cached_second, prefix = _iso_second_cache
+    if seconds != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+        _iso_second_cache = (seconds, prefix)
+    return f"{prefix}.{int((t - seconds) * 1e6):06d}"
 
 @dataclass
 class AppContext:
-    """Application context containing database connections and resources"""
-    db: Database
+    """Application context containing storage managers and tool instances"""
     storage_paths: StoragePaths
+    storage_initializer: StorageInitializer
     file_manager: FileManager
     save_conversation_tool: SaveConversationTool
     search_knowledge_tool: SearchKnowledgeTool
@@ -86,49 +126,148 @@ async def app_lifespan(_: FastMCP):
     logger.info("Starting Synapse MCP Server...")
     
     try:
-        # Initialize storage system
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, initialize_synapse_storage)
-        
-        # Connect to database
-        db = await Database.connect()
-        
-        # Create resource managers
-        storage_paths = StoragePaths()
-        file_manager = FileManager(storage_paths)
-        
-        # Create tool instances
-        save_conversation_tool = SaveConversationTool(storage_paths)
-        search_knowledge_tool = SearchKnowledgeTool(storage_paths, file_manager)
-        inject_context_tool = InjectContextTool()
-        extract_solutions_tool = ExtractSolutionsTool(storage_paths)
-        
-        # Create application context
-        app_context = AppContext(
-            db=db, 
-            storage_paths=storage_paths,
-            file_manager=file_manager,
-            save_conversation_tool=save_conversation_tool,
-            search_knowledge_tool=search_knowledge_tool,
-            inject_context_tool=inject_context_tool,
-            extract_solutions_tool=extract_solutions_tool
-        )
-        
-        logger.info("Synapse MCP Server started successfully")
-        yield app_context
+        # Resources register their cleanup on the exit stack as soon as they are
+        # acquired, so a failure later in startup still releases them in reverse order
+        async with AsyncExitStack() as stack:
+            # Initialize storage system
+            await asyncio.to_thread(initialize_synapse_storage)
+            
+            # Create resource managers
+            storage_paths = StoragePaths()
+            file_manager = FileManager(storage_paths)
+            
+            # Create tool instances
+            save_conversation_tool = SaveConversationTool(storage_paths)
+            search_knowledge_tool = SearchKnowledgeTool(storage_paths, file_manager)
+            inject_context_tool = InjectContextTool()
+            extract_solutions_tool = ExtractSolutionsTool(storage_paths)
+            
+            # Flush group-committed fsyncs and dirty indexes of every FileManager at
+            # shutdown rather than relying on atexit
+            for manager in (file_manager, save_conversation_tool.file_manager, extract_solutions_tool.file_manager):
+                stack.push_async_callback(asyncio.to_thread, manager.flush)
+            
+            # Create application context
+            app_context = AppContext(
+                storage_paths=storage_paths,
+                storage_initializer=StorageInitializer(storage_paths),
+                file_manager=file_manager,
+                save_conversation_tool=save_conversation_tool,
+                search_knowledge_tool=search_knowledge_tool,
+                inject_context_tool=inject_context_tool,
+                extract_solutions_tool=extract_solutions_tool
+            )
+            
+            # Runs first on exit, before the resources above are released
+            stack.callback(logger.info, "Shutting down Synapse MCP Server...")
+            
+            logger.info("Synapse MCP Server started successfully")
+            yield app_context
         
     except Exception as e:
         logger.error(f"Server startup failed: {str(e)}")
         raise
     finally:
-        # Cleanup resources
-        logger.info("Shutting down Synapse MCP Server...")
-        if 'db' in locals():
-            await db.disconnect()
         logger.info("Synapse MCP Server shutdown complete")
 
+# 生命周期上下文不可用时（例如直接调用工具函数）使用的共享实例，首次使用时创建一次
+_fallback_ctx: "AppContext | None" = None
+_fallback_ctx_lock = threading.Lock()
+
+
+def _get_fallback_ctx() -> AppContext:
+    """
+    获取缓存的后备应用上下文
+    
+    在无法通过 ctx.request_context 获取生命周期上下文时使用，
+    避免每次工具调用都重新创建 StoragePaths、StorageInitializer、FileManager 和工具实例。
+    
+    Returns:
+        AppContext: 进程内共享的应用上下文
+    """
+    global _fallback_ctx
+    if _fallback_ctx is None:
+        with _fallback_ctx_lock:
+            if _fallback_ctx is None:
+                storage_paths = StoragePaths()
+                file_manager = FileManager(storage_paths)
+                _fallback_ctx = AppContext(
+                    storage_paths=storage_paths,
+                    storage_initializer=StorageInitializer(storage_paths),
+                    file_manager=file_manager,
+                    save_conversation_tool=SaveConversationTool(storage_paths),
+                    search_knowledge_tool=SearchKnowledgeTool(storage_paths, file_manager),
+                    inject_context_tool=InjectContextTool(),
+                    extract_solutions_tool=ExtractSolutionsTool(storage_paths)
+                )
+    return _fallback_ctx
+
+
+def _lifespan_context(ctx) -> "AppContext | None":
+    """
+    读取请求上下文中的生命周期上下文
+    
+    使用带默认值的 getattr 取代逐层 hasattr 检查，ctx 为空或属性缺失时返回 None。
+    """
+    if not ctx:
+        return None
+    return getattr(getattr(ctx, "request_context", None), "lifespan_context", None)
+
+
+async def _dispatch(ctx, attr: str, method: str, /, **kwargs):
+    """
+    调用应用上下文中工具实例的方法（四个核心MCP工具共用的调用路径）
+    
+    协程方法直接等待；同步方法放到工作线程执行，避免阻塞事件循环。
+    
+    Args:
+        ctx: MCP上下文对象，可为None（此时使用后备上下文）
+        attr: AppContext 中的工具属性名，如 "search_knowledge_tool"
+        method: 要调用的工具方法名
+        **kwargs: 传递给工具方法的参数
+        
+    Returns:
+        工具方法的返回值
+    """
+    tool = getattr(_lifespan_context(ctx) or _get_fallback_ctx(), attr)
+    func = getattr(tool, method)
+    if inspect.iscoroutinefunction(func):
+        return await func(**kwargs)
+    return await asyncio.to_thread(func, **kwargs)
+
+
+async def _report_tool_error(ctx, action: str, detail: str, error_msg: str) -> None:
+    """
+    统一的工具失败报告：向客户端发送错误通知并记录日志
+    
+    Args:
+        ctx: MCP上下文对象，可为None
+        action: 失败的操作描述，如 "上下文注入失败"
+        detail: 写入日志的附加信息（查询、标题等）
+        error_msg: 错误消息
+    """
+    if ctx:
+        await ctx.error(f"{action}: {error_msg}")
+    logger.error(f"{action} - {detail}, 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
+
+# get_storage_info 结果缓存 (monotonic时间戳, 结果)，客户端频繁轮询时避免重复遍历存储目录
+_STORAGE_INFO_TTL_SECONDS = 5.0
+_storage_info_cache: "tuple[float, dict] | None" = None
+
+
+def _invalidate_storage_info_cache(ctx) -> None:
+    """
+    丢弃 get_storage_info 的缓存结果，修改存储内容的工具完成写入后调用
+    
+    工具实例各自持有FileManager，共享FileManager的统计缓存同样需要丢弃。
+    """
+    global _storage_info_cache
+    _storage_info_cache = None
+    (_lifespan_context(ctx) or _get_fallback_ctx()).file_manager.invalidate_statistics()
+
 # Create FastMCP server instance
-mcp = FastMCP("synapse-mcp", lifespan=app_lifespan)
+# 模块被重新加载（热重载、测试中 importlib.reload）时复用已有实例，避免重复构建服务器并重新注册全部工具
+mcp = globals().get("mcp") or FastMCP("synapse-mcp", lifespan=app_lifespan)
 
 # ==================== Internal Analysis Functions ====================
 
@@ -274,13 +413,14 @@ async def save_conversation(
             - storage_path: 文件存储路径
     """
     try:
-        if ctx:
-            await ctx.info(f"Starting conversation save: {title}")
-        
-        # Basic parameter validation
-        if not title or not title.strip():
+        # Basic parameter validation (before any client notification, so bad calls fail fast)
+        title = title.strip() if title else ""
+        if not title:
             raise ValueError("Conversation title cannot be empty")
         
+        if importance is not None and not 1 <= importance <= 5:
+            raise ValueError("Importance level must be between 1-5")
+        
         # Require AI analysis - no fallback allowed
         if not ai_summary:
             # Get the conversation analysis prompt to show user what they should do
@@ -304,28 +444,17 @@ async def save_conversation(
 
 提示词预览：
 {analysis_prompt[:200]}..."""
-
-            if ctx:
-                await ctx.error("缺少AI分析结果 - 无法保存对话")
-                await ctx.info("请使用 conversation_analysis_prompt 获取分析模板")
             
+            # 错误通知由下方的 ValueError 处理器统一发送
             raise ValueError(error_message)
         
         auto_analysis_used = False
         
-        if importance is not None and (importance < 1 or importance > 5):
-            raise ValueError("Importance level must be between 1-5")
-        
-        # Get save conversation tool instance
-        save_tool = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            save_tool = ctx.request_context.lifespan_context.save_conversation_tool
-        
-        if not save_tool:
-            raise RuntimeError("无法获取SaveConversationTool实例，请检查服务器配置")
-        
-        if ctx:
-            await ctx.info("Processing conversation with AI analysis results...")
+        # 进度信息在工具结束时一次性发送，减少通知往返
+        progress = [
+            f"Starting conversation save: {title}",
+            "Processing conversation with AI analysis results..."
+        ]
         
         # Create conversation content from AI analysis
         # Since AI analysis is now required, we know the complete conversation was analyzed
@@ -343,8 +472,9 @@ async def save_conversation(
 AI分析确保了所有重要的技术内容、上下文信息和解决方案都被正确提取和保存。"""
         
         # 使用SaveConversationTool进行保存
-        result = await save_tool.save_conversation(
-            title=title.strip(),
+        result = await _dispatch(
+            ctx, "save_conversation_tool", "save_conversation",
+            title=title,
             content=conversation_content,
             user_tags=tags,
             user_category=category,
@@ -358,6 +488,7 @@ AI分析确保了所有重要的技术内容、上下文信息和解决方案都
             ai_solutions=ai_solutions,
             ctx=ctx
         )
+        _invalidate_storage_info_cache(ctx)
         
         # 检查保存结果
         if not result.get("success", False):
@@ -367,13 +498,12 @@ AI分析确保了所有重要的技术内容、上下文信息和解决方案都
         conversation_info = result.get("conversation", {})
         duplicates_count = result.get("duplicates_found", 0)
         
+        if duplicates_count > 0:
+            progress.append(f"检测到 {duplicates_count} 个相似对话")
+        progress.append(f"对话保存成功: {conversation_info.get('id', 'Unknown')}")
+        progress.append(f"使用完整AI分析结果，包含 {conversation_info.get('auto_tags_count', 0)} 个标签")
         if ctx:
-            if duplicates_count > 0:
-                await ctx.info(f"检测到 {duplicates_count} 个相似对话")
-            
-            await ctx.info(f"对话保存成功: {conversation_info.get('id', 'Unknown')}")
-            
-            await ctx.info(f"使用完整AI分析结果，包含 {conversation_info.get('auto_tags_count', 0)} 个标签")
+            await ctx.info("\n".join(progress))
         
         # 构建返回结果（与其他工具风格保持一致）
         return {
@@ -417,30 +547,28 @@ AI分析确保了所有重要的技术内容、上下文信息和解决方案都
     except Exception as e:
         # For other errors (like storage/system issues), return error dict to allow handling
         error_msg = str(e)
-        if ctx:
-            await ctx.error(f"保存对话失败: {error_msg}")
+        await _report_tool_error(ctx, "保存对话失败", f"标题: {title[:50]}...", error_msg)
         
-        logger.error(f"保存对话失败 - 标题: {title[:50]}..., 错误: {error_msg}", exc_info=True)
-        
-        return {
-            "success": False,
-            "error": error_msg,
-            "error_type": type(e).__name__,
-            "conversation": None,
-            "analysis": {
+        response = _SAVE_ERROR_TEMPLATE.copy()
+        response.update(
+            error=error_msg,
+            error_type=type(e).__name__,
+            analysis={
                 "method": "分析失败",
                 "ai_analysis_provided": False,
                 "tags_extracted": 0,
                 "user_tags_added": 0,
                 "solutions_found": 0
             }
-        }
+        )
+        return response
 
 @mcp.tool()
 async def search_knowledge(
     query: str,
     search_in: str = "all",
     limit: int = 10,
+    include_content: bool = True,
     ctx: Context = None
 ) -> dict:
     """
@@ -463,6 +591,7 @@ async def search_knowledge(
         query: 搜索关键词（由AI理解用户问题后生成）（必需）
         search_in: 搜索范围 ("title", "content", "tags", "all")
         limit: 返回结果数量 (1-50)
+        include_content: 是否返回解决方案完整内容；只需要片段和元数据时设为False以减小响应体积
         ctx: MCP上下文对象
         
     Returns:
@@ -484,25 +613,26 @@ async def search_knowledge(
         }
     """
     try:
-        if ctx:
-            await ctx.info(f"开始AI语义搜索: '{query}'")
-        
-        # 获取搜索知识工具实例
-        search_tool = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            search_tool = ctx.request_context.lifespan_context.search_knowledge_tool
-        
-        if not search_tool:
-            raise RuntimeError("无法获取SearchKnowledgeTool实例，请检查服务器配置")
+        # 进度信息在工具结束时一次性发送，减少通知往返
+        query = query.strip() if query else ""
+        progress = [f"开始AI语义搜索: '{query}'"]
         
-        if ctx:
-            await ctx.info("执行简单文本搜索...")
+        progress.append("执行简单文本搜索...")
         
-        # 使用简化的SearchKnowledgeTool进行grep搜索
-        result = search_tool.search_knowledge(
-            query=query.strip(),
-            search_in=search_in
-        )
+        # 使用简化的SearchKnowledgeTool进行grep搜索（同步磁盘I/O，在工作线程中执行）
+        # 工作线程无法被强制中断，请求被取消时通过事件通知搜索提前结束并释放线程
+        cancel_event = threading.Event()
+        try:
+            result = await _dispatch(
+                ctx, "search_knowledge_tool", "search_knowledge",
+                query=query,
+                search_in=search_in,
+                include_content=include_content,
+                cancel_event=cancel_event
+            )
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
         
         # 检查搜索结果
         if not result:
@@ -510,31 +640,25 @@ async def search_knowledge(
         
         processing_time = result.get("processing_time_ms", 0)
         total_found = result.get("total_found", 0)
+        suggestion = result.get("suggestion")
         
+        progress.append(f"grep搜索完成: 找到 {total_found} 个结果，耗时 {processing_time:.2f}ms")
+        if suggestion:
+            progress.append(f"AI建议: {suggestion}")
         if ctx:
-            await ctx.info(f"grep搜索完成: 找到 {total_found} 个结果，耗时 {processing_time:.2f}ms")
-            if result.get("suggestion"):
-                await ctx.info(f"AI建议: {result['suggestion']}")
+            await ctx.info("\n".join(progress))
         
         # 返回简化的搜索结果
         return result
         
     except Exception as e:
         error_msg = str(e)
-        if ctx:
-            await ctx.error(f"简化grep搜索失败: {error_msg}")
-        
-        logger.error(f"简化grep搜索失败 - 查询: '{query}', 错误: {error_msg}", exc_info=True)
+        await _report_tool_error(ctx, "简化grep搜索失败", f"查询: '{query}'", error_msg)
         
         # 返回错误信息
-        return {
-            "query": query,
-            "total_found": 0,
-            "search_area": search_in,
-            "results": [],
-            "error": error_msg,
-            "processing_time_ms": 0
-        }
+        response = _SEARCH_ERROR_TEMPLATE.copy()
+        response.update(query=query, search_area=search_in, results=[], error=error_msg)
+        return response
 
 
 @mcp.tool()
@@ -576,30 +700,24 @@ async def inject_context(
         }
     """
     try:
-        if ctx:
-            await ctx.info(f"开始智能上下文注入: '{current_query[:50]}'")
-        
         # 基础参数验证
-        if not current_query or not current_query.strip():
+        current_query = current_query.strip() if current_query else ""
+        if not current_query:
             raise ValueError("当前查询不能为空")
         
         if not isinstance(search_results, list):
             raise ValueError("search_results 必须是列表类型")
         
-        # 获取上下文注入工具实例
-        inject_tool = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            inject_tool = ctx.request_context.lifespan_context.inject_context_tool
-        
-        if not inject_tool:
-            raise RuntimeError("无法获取InjectContextTool实例，请检查服务器配置")
-        
-        if ctx:
-            await ctx.info(f"处理 {len(search_results)} 个搜索结果...")
+        # 进度信息在工具结束时一次性发送，减少通知往返
+        progress = [
+            f"开始智能上下文注入: '{current_query[:50]}'",
+            f"处理 {len(search_results)} 个搜索结果..."
+        ]
         
         # 使用InjectContextTool进行智能上下文注入
-        result = await inject_tool.inject_context(
-            current_query=current_query.strip(),
+        result = await _dispatch(
+            ctx, "inject_context_tool", "inject_context",
+            current_query=current_query,
             search_results=search_results,
             include_solutions=include_solutions,
             include_conversations=include_conversations,
@@ -613,25 +731,26 @@ async def inject_context(
         context_items_count = result.get("total_items", 0)
         processing_time = result.get("processing_time_ms", 0)
         
-        if ctx:
-            if context_items_count > 0:
-                await ctx.info(f"成功注入 {context_items_count} 个相关上下文项")
-                
-                # 提供详细的注入统计信息
-                stats = result.get("search_statistics", {})
-                if stats:
-                    candidates = stats.get("candidates_found", 0)
-                    above_threshold = stats.get("above_threshold", 0)
-                    if candidates > 0:
-                        await ctx.info(f"注入统计: {candidates} 个候选 → {above_threshold} 个符合阈值 → {context_items_count} 个最终选择")
-                
-                # 性能信息
-                if processing_time > 300:
-                    await ctx.info(f"处理时间: {processing_time:.2f}ms (目标<500ms)")
-                else:
-                    await ctx.info(f"处理高效: {processing_time:.2f}ms")
+        if context_items_count > 0:
+            progress.append(f"成功注入 {context_items_count} 个相关上下文项")
+            
+            # 提供详细的注入统计信息
+            stats = result.get("search_statistics", {})
+            if stats:
+                candidates = stats.get("candidates_found", 0)
+                above_threshold = stats.get("above_threshold", 0)
+                if candidates > 0:
+                    progress.append(f"注入统计: {candidates} 个候选 → {above_threshold} 个符合阈值 → {context_items_count} 个最终选择")
+            
+            # 性能信息
+            if processing_time > 300:
+                progress.append(f"处理时间: {processing_time:.2f}ms (目标<500ms)")
             else:
-                await ctx.info(f"未找到符合阈值 {relevance_threshold} 的相关上下文")
+                progress.append(f"处理高效: {processing_time:.2f}ms")
+        else:
+            progress.append("未找到相关上下文")
+        if ctx:
+            await ctx.info("\n".join(progress))
         
         # 返回简化的结果格式
         return {
@@ -644,26 +763,24 @@ async def inject_context(
         
     except Exception as e:
         error_msg = str(e)
-        if ctx:
-            await ctx.error(f"上下文注入失败: {error_msg}")
-        
-        logger.error(f"上下文注入失败 - 查询: '{current_query}', 错误: {error_msg}", exc_info=True)
+        await _report_tool_error(ctx, "上下文注入失败", f"查询: '{current_query}'", error_msg)
         
         # 返回错误信息而不是抛出异常，让调用方能够处理
-        return {
-            "content": [],
-            "injection_summary": f"注入失败: {error_msg}",
-            "total_items": 0,
-            "query": current_query,
-            "processing_time_ms": 0,
-            "error": error_msg
-        }
+        response = _INJECT_ERROR_TEMPLATE.copy()
+        response.update(
+            content=[],
+            injection_summary=f"注入失败: {error_msg}",
+            query=current_query,
+            error=error_msg
+        )
+        return response
 
 @mcp.tool()
 async def export_data(
     export_path: str,
     include_backups: bool = False,
     include_cache: bool = False,
+    pretty_json: bool = False,
     ctx: Context = None
 ) -> dict:
     """
@@ -676,6 +793,7 @@ async def export_data(
         export_path: Target directory path for exported data (required)
         include_backups: Whether to include backup files in export (default: False)
         include_cache: Whether to include cache files in export (default: False)
+        pretty_json: Re-indent exported JSON files for readability; stored files are compact (default: False)
         ctx: MCP context object for logging and progress reporting
         
     Returns:
@@ -686,23 +804,19 @@ async def export_data(
             await ctx.info(f"Starting data export to: {export_path}")
         
         # Parameter validation
-        if not export_path or not export_path.strip():
+        export_path = export_path.strip() if export_path else ""
+        if not export_path:
             raise ValueError("Export path cannot be empty")
         
         from pathlib import Path
-        export_dir = Path(export_path.strip()).expanduser().resolve()
+        export_dir = Path(export_path).expanduser().resolve()
         
         # Check if export path is valid and writable
         if export_dir.exists() and not export_dir.is_dir():
             raise ValueError(f"Export path exists but is not a directory: {export_dir}")
         
         # Get file manager instance
-        file_manager = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            file_manager = ctx.request_context.lifespan_context.file_manager
-        
-        if not file_manager:
-            raise RuntimeError("无法获取FileManager实例，请检查服务器配置")
+        file_manager = (_lifespan_context(ctx) or _get_fallback_ctx()).file_manager
         
         if ctx:
             await ctx.info("Validating export directory permissions...")
@@ -726,7 +840,7 @@ async def export_data(
             await ctx.report_progress(progress=0.2, message="Starting data export...")
         
         # Perform the export using FileManager
-        export_success = file_manager.export_data(export_dir, include_backups=include_backups)
+        export_success = file_manager.export_data(export_dir, include_backups=include_backups, pretty=pretty_json)
         
         if not export_success:
             raise RuntimeError("Export operation failed - check file manager logs for details")
@@ -742,7 +856,7 @@ async def export_data(
         result = {
             "success": True,
             "export_path": str(export_dir),
-            "exported_at": datetime.now().isoformat(),
+            "exported_at": _fast_iso(),
             "statistics": {
                 "total_conversations_exported": storage_stats.total_conversations,
                 "total_solutions_exported": storage_stats.total_solutions,
@@ -770,14 +884,14 @@ async def export_data(
         if ctx:
             await ctx.error(f"Data export failed: {error_msg}")
         
-        logger.error(f"数据导出失败 - 路径: {export_path}, 错误: {error_msg}", exc_info=True)
+        logger.error(f"数据导出失败 - 路径: {export_path}, 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return {
             "success": False,
             "export_path": export_path,
             "error": error_msg,
             "error_type": type(e).__name__,
-            "exported_at": datetime.now().isoformat(),
+            "exported_at": _fast_iso(),
             "statistics": {
                 "total_conversations_exported": 0,
                 "total_solutions_exported": 0,
@@ -814,19 +928,22 @@ async def import_data(
     Returns:
         dict: Import result with status, statistics, and validation results
     """
+    validation_results = {}
+    
     try:
         if ctx:
             await ctx.info(f"Starting data import from: {import_path}")
         
         # Parameter validation
-        if not import_path or not import_path.strip():
+        import_path = import_path.strip() if import_path else ""
+        if not import_path:
             raise ValueError("Import path cannot be empty")
         
-        if merge_mode not in ["append", "overwrite"]:
+        if merge_mode not in _MERGE_MODES:
             raise ValueError("Merge mode must be 'append' or 'overwrite'")
         
         from pathlib import Path
-        import_dir = Path(import_path.strip()).expanduser().resolve()
+        import_dir = Path(import_path).expanduser().resolve()
         
         # Check if import path exists and is valid
         if not import_dir.exists():
@@ -836,12 +953,7 @@ async def import_data(
             raise ValueError(f"Import path is not a directory: {import_dir}")
         
         # Get file manager instance
-        file_manager = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            file_manager = ctx.request_context.lifespan_context.file_manager
-        
-        if not file_manager:
-            raise RuntimeError("无法获取FileManager实例，请检查服务器配置")
+        file_manager = (_lifespan_context(ctx) or _get_fallback_ctx()).file_manager
         
         if ctx:
             await ctx.info("Validating import data structure...")
@@ -960,6 +1072,7 @@ async def import_data(
             
             # Perform the import using FileManager
             import_success = file_manager.import_data(import_dir, merge_mode=merge_mode)
+            _invalidate_storage_info_cache(ctx)
             
             if not import_success:
                 raise RuntimeError("Import operation failed - check file manager logs for details")
@@ -978,7 +1091,7 @@ async def import_data(
             result = {
                 "success": True,
                 "import_path": str(import_dir),
-                "imported_at": datetime.now().isoformat(),
+                "imported_at": _fast_iso(),
                 "merge_mode": merge_mode,
                 "validation_performed": validate_data,
                 "backup_created": create_backup,
@@ -1009,18 +1122,18 @@ async def import_data(
         if ctx:
             await ctx.error(f"Data import failed: {error_msg}")
         
-        logger.error(f"数据导入失败 - 路径: {import_path}, 错误: {error_msg}", exc_info=True)
+        logger.error(f"数据导入失败 - 路径: {import_path}, 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return {
             "success": False,
             "import_path": import_path,
             "error": error_msg,
             "error_type": type(e).__name__,
-            "imported_at": datetime.now().isoformat(),
+            "imported_at": _fast_iso(),
             "merge_mode": merge_mode,
             "validation_performed": validate_data,
             "backup_created": create_backup,
-            "validation_results": validation_results if 'validation_results' in locals() else {},
+            "validation_results": validation_results,
             "summary": f"Import failed: {error_msg}"
         }
 
@@ -1043,21 +1156,25 @@ async def get_storage_info(ctx: Context = None) -> dict:
             - Initialization status
             - System health information
     """
+    global _storage_info_cache
     try:
+        now = time.monotonic()
+        cache = _storage_info_cache
+        if cache and now - cache[0] < _STORAGE_INFO_TTL_SECONDS:
+            return cache[1]
+        
         if ctx:
             await ctx.info("Retrieving storage system information")
         
-        # Initialize storage system components
-        storage_paths = StoragePaths()
-        initializer = StorageInitializer(storage_paths)
+        # Get shared storage components (lifespan context, or the cached fallback)
+        app_ctx = _lifespan_context(ctx) or _get_fallback_ctx()
         
-        # Get file manager instance for statistics
-        file_manager = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            file_manager = ctx.request_context.lifespan_context.file_manager
+        storage_paths = app_ctx.storage_paths
+        initializer = app_ctx.storage_initializer
+        file_manager = app_ctx.file_manager
         
         # Get comprehensive storage status
-        storage_status = initializer.get_storage_status()
+        storage_status = await asyncio.to_thread(initializer.get_storage_status)
         
         # Calculate storage size in MB
         total_size_mb = storage_status["total_size_bytes"] / (1024 * 1024) if storage_status["total_size_bytes"] > 0 else 0.0
@@ -1097,7 +1214,7 @@ async def get_storage_info(ctx: Context = None) -> dict:
                     latest_backup = max(backup_files, key=lambda x: x.stat().st_mtime if x.exists() else 0)
                     backup_info["latest_backup"] = {
                         "path": str(latest_backup),
-                        "created_at": datetime.fromtimestamp(latest_backup.stat().st_mtime).isoformat(),
+                        "created_at": _fast_iso(latest_backup.stat().st_mtime),
                         "size_mb": round(sum(f.stat().st_size for f in latest_backup.rglob("*") if f.is_file()) / (1024*1024), 2)
                     }
                 
@@ -1156,10 +1273,8 @@ async def get_storage_info(ctx: Context = None) -> dict:
         # Try to get last maintenance timestamp from metadata
         try:
             metadata_file = storage_paths.get_indexes_dir() / "metadata.json"
-            if metadata_file.exists():
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    maintenance_info["last_maintenance"] = metadata.get("last_maintenance")
+            metadata = await asyncio.to_thread(_load_or_default, metadata_file, _default_metadata)
+            maintenance_info["last_maintenance"] = metadata.get("last_maintenance")
         except Exception:
             pass
         
@@ -1205,19 +1320,21 @@ async def get_storage_info(ctx: Context = None) -> dict:
             "server_status": "running",
             "version": "1.0.0",
             "platform": sys.platform,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": _fast_iso()
         }
         
         if ctx:
             await ctx.info(f"Storage information retrieved successfully - Initialized: {storage_status['initialized']}")
         
+        _storage_info_cache = (now, storage_info)
         return storage_info
         
     except Exception as e:
+        error_msg = f"Failed to retrieve storage information: {e}"
         if ctx:
-            await ctx.error(f"Failed to retrieve storage information: {str(e)}")
-        logger.error(f"Failed to retrieve storage information: {str(e)}", exc_info=True)
-        raise ValueError(f"Failed to retrieve storage information: {str(e)}")
+            await ctx.error(error_msg)
+        logger.error(error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
+        raise ValueError(error_msg)
 
 @mcp.tool()
 async def backup_data(
@@ -1246,12 +1363,7 @@ async def backup_data(
             await ctx.info("Starting manual data backup...")
         
         # Get file manager instance
-        file_manager = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            file_manager = ctx.request_context.lifespan_context.file_manager
-        
-        if not file_manager:
-            raise RuntimeError("无法获取FileManager实例，请检查服务器配置")
+        file_manager = (_lifespan_context(ctx) or _get_fallback_ctx()).file_manager
         
         # Generate backup name if not provided
         if not backup_name:
@@ -1283,6 +1395,7 @@ async def backup_data(
         
         # Perform the backup
         backup_success = file_manager.export_data(backup_path, include_backups=False)
+        _invalidate_storage_info_cache(ctx)
         
         if not backup_success:
             raise RuntimeError("Backup operation failed - check file manager logs for details")
@@ -1314,7 +1427,7 @@ async def backup_data(
         # Create backup metadata
         backup_metadata = {
             "backup_name": backup_name,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _fast_iso(),
             "backup_type": "manual",
             "source_statistics": {
                 "conversations_count": storage_stats.total_conversations,
@@ -1344,7 +1457,7 @@ async def backup_data(
             "success": True,
             "backup_name": backup_name,
             "backup_path": str(backup_path),
-            "created_at": datetime.now().isoformat(),
+            "created_at": _fast_iso(),
             "backup_type": "manual",
             "statistics": backup_stats,
             "source_data": {
@@ -1366,14 +1479,14 @@ async def backup_data(
         if ctx:
             await ctx.error(f"Backup creation failed: {error_msg}")
         
-        logger.error(f"备份创建失败 - 名称: {backup_name}, 错误: {error_msg}", exc_info=True)
+        logger.error(f"备份创建失败 - 名称: {backup_name}, 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return {
             "success": False,
             "backup_name": backup_name or "unknown",
             "error": error_msg,
             "error_type": type(e).__name__,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _fast_iso(),
             "summary": f"Backup creation failed: {error_msg}"
         }
 
@@ -1401,27 +1514,25 @@ async def restore_backup(
     Returns:
         dict: Restore result with status, statistics, and verification results
     """
+    verification_results = {}
+    
     try:
         if ctx:
             await ctx.info(f"Starting backup restore: {backup_name}")
         
         # Parameter validation
-        if not backup_name or not backup_name.strip():
+        backup_name = backup_name.strip() if backup_name else ""
+        if not backup_name:
             raise ValueError("Backup name cannot be empty")
         
-        if restore_mode not in ["append", "overwrite"]:
+        if restore_mode not in _MERGE_MODES:
             raise ValueError("Restore mode must be 'append' or 'overwrite'")
         
         # Get file manager instance
-        file_manager = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            file_manager = ctx.request_context.lifespan_context.file_manager
-        
-        if not file_manager:
-            raise RuntimeError("无法获取FileManager实例，请检查服务器配置")
+        file_manager = (_lifespan_context(ctx) or _get_fallback_ctx()).file_manager
         
         # Locate backup directory
-        backup_path = file_manager.storage_paths.get_backups_dir() / backup_name.strip()
+        backup_path = file_manager.storage_paths.get_backups_dir() / backup_name
         
         if not backup_path.exists():
             raise FileNotFoundError(f"Backup not found: {backup_name}")
@@ -1509,6 +1620,7 @@ async def restore_backup(
         
         # Perform the restore using FileManager import
         restore_success = file_manager.import_data(backup_path, merge_mode=restore_mode)
+        _invalidate_storage_info_cache(ctx)
         
         if not restore_success:
             raise RuntimeError("Restore operation failed - check file manager logs for details")
@@ -1528,7 +1640,7 @@ async def restore_backup(
             "success": True,
             "backup_name": backup_name,
             "backup_path": str(backup_path),
-            "restored_at": datetime.now().isoformat(),
+            "restored_at": _fast_iso(),
             "restore_mode": restore_mode,
             "verification_performed": verify_backup,
             "pre_restore_backup_created": create_restore_backup,
@@ -1555,18 +1667,18 @@ async def restore_backup(
         if ctx:
             await ctx.error(f"Backup restore failed: {error_msg}")
         
-        logger.error(f"备份恢复失败 - 备份: {backup_name}, 错误: {error_msg}", exc_info=True)
+        logger.error(f"备份恢复失败 - 备份: {backup_name}, 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return {
             "success": False,
             "backup_name": backup_name,
             "error": error_msg,
             "error_type": type(e).__name__,
-            "restored_at": datetime.now().isoformat(),
+            "restored_at": _fast_iso(),
             "restore_mode": restore_mode,
             "verification_performed": verify_backup,
             "pre_restore_backup_created": create_restore_backup,
-            "verification_results": verification_results if 'verification_results' in locals() else {},
+            "verification_results": verification_results,
             "summary": f"Restore failed: {error_msg}"
         }
 
@@ -1612,35 +1724,27 @@ async def extract_solutions(
         }
     """
     try:
-        start_time = time.time()
-        
-        if ctx:
-            await ctx.info(f"开始解决方案提取任务")
-            if conversation_id:
-                await ctx.info(f"目标对话: {conversation_id}")
-            else:
-                await ctx.info("处理所有对话记录")
+        start_ns = time.perf_counter_ns()
         
         # 参数验证
-        if extract_type not in ["code", "approach", "pattern", "all"]:
+        if extract_type not in _EXTRACT_TYPES:
             raise ValueError("extract_type必须是 'code', 'approach', 'pattern' 或 'all'")
         
-        if not isinstance(min_reusability_score, (int, float)) or min_reusability_score < 0 or min_reusability_score > 1:
+        # 类型已由MCP框架按签名校验并转换为float，这里只检查范围
+        if not 0 <= min_reusability_score <= 1:
             raise ValueError("min_reusability_score必须在0.0-1.0之间")
         
-        # 获取提取解决方案工具实例
-        extract_tool = None
-        if ctx and hasattr(ctx, 'request_context') and hasattr(ctx.request_context, 'lifespan_context'):
-            extract_tool = ctx.request_context.lifespan_context.extract_solutions_tool
-        
-        if not extract_tool:
-            raise RuntimeError("无法获取ExtractSolutionsTool实例，请检查服务器配置")
-        
-        if ctx:
-            await ctx.info(f"使用参数: 类型={extract_type}, 最低质量={min_reusability_score}")
+        # 进度信息在工具结束时一次性发送，减少通知往返
+        progress = ["开始解决方案提取任务"]
+        if conversation_id:
+            progress.append(f"目标对话: {conversation_id}")
+        else:
+            progress.append("处理所有对话记录")
+        progress.append(f"使用参数: 类型={extract_type}, 最低质量={min_reusability_score}")
         
         # 执行解决方案提取
-        result = await extract_tool.extract_solutions(
+        result = await _dispatch(
+            ctx, "extract_solutions_tool", "extract_solutions",
             conversation_id=conversation_id,
             extract_type=extract_type,
             min_reusability_score=min_reusability_score,
@@ -1648,6 +1752,7 @@ async def extract_solutions(
             overwrite_existing=overwrite_existing,
             ctx=ctx
         )
+        _invalidate_storage_info_cache(ctx)
         
         # 检查提取结果
         if not result.get("success", False):
@@ -1655,86 +1760,68 @@ async def extract_solutions(
             raise RuntimeError(f"解决方案提取失败: {error_msg}")
         
         # 计算处理时间
-        processing_time = (time.time() - start_time) * 1000
-        result["statistics"]["processing_time_ms"] = round(processing_time, 2)
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e6
+        processing_time_ms = round(processing_time, 2)
+        result["statistics"]["processing_time_ms"] = processing_time_ms
         
         total_solutions = result.get("total_extracted", 0)
         conversations_processed = result.get("conversations_processed", 0)
+        storage_info = result.get("storage_info") or {}
+        
+        progress.append(f"提取完成: {total_solutions} 个解决方案来自 {conversations_processed} 个对话")
+        
+        if save_solutions:
+            files_created = len(storage_info.get("files_created") or [])
+            if files_created > 0:
+                progress.append(f"已保存到 {files_created} 个文件")
         
+        # 性能信息
+        if processing_time > 1000:  # > 1秒
+            progress.append(f"处理时间: {processing_time:.2f}ms")
+        else:
+            progress.append(f"处理高效: {processing_time:.2f}ms")
         if ctx:
-            await ctx.info(f"提取完成: {total_solutions} 个解决方案来自 {conversations_processed} 个对话")
-            
-            if save_solutions:
-                files_created = len(result.get("storage_info", {}).get("files_created", []))
-                if files_created > 0:
-                    await ctx.info(f"已保存到 {files_created} 个文件")
-            
-            # 性能信息
-            if processing_time > 1000:  # > 1秒
-                await ctx.info(f"处理时间: {processing_time:.2f}ms")
-            else:
-                await ctx.info(f"处理高效: {processing_time:.2f}ms")
+            await ctx.info("\n".join(progress))
         
-        # 增强返回结果格式
-        enhanced_result = {
-            # 基本兼容信息
-            "success": True,
-            "solutions": result.get("solutions", []),
-            "total_extracted": total_solutions,
-            "conversations_processed": conversations_processed,
-            "conversations_with_solutions": result.get("conversations_with_solutions", 0),
-            "extraction_summary": result.get("extraction_summary", ""),
-            
+        # 在工具返回的结果上补充包装层字段，避免重新拷贝每个嵌套值
+        result.update(
             # 处理参数信息
-            "extraction_parameters": {
+            extraction_parameters={
                 "conversation_id": conversation_id,
                 "extract_type": extract_type,
                 "min_reusability_score": min_reusability_score,
                 "save_solutions": save_solutions,
                 "overwrite_existing": overwrite_existing
             },
-            
-            # 详细统计信息
-            "statistics": result.get("statistics", {}),
-            
-            # 存储信息
-            "storage_info": result.get("storage_info", {}),
-            
             # 元数据
-            "processing_time_ms": round(processing_time, 2),
-            "extracted_at": datetime.now().isoformat(),
-            "extraction_engine": "synapse_solution_extractor_v1.0"
-        }
+            processing_time_ms=processing_time_ms,
+            extracted_at=_fast_iso(),
+            extraction_engine="synapse_solution_extractor_v1.0"
+        )
         
-        return enhanced_result
+        return result
         
     except Exception as e:
         error_msg = str(e)
-        if ctx:
-            await ctx.error(f"解决方案提取失败: {error_msg}")
-        
-        logger.error(f"解决方案提取失败 - 对话: {conversation_id}, 错误: {error_msg}", exc_info=True)
+        await _report_tool_error(ctx, "解决方案提取失败", f"对话: {conversation_id}", error_msg)
         
         # 返回错误信息而不是抛出异常
-        return {
-            "success": False,
-            "error": error_msg,
-            "error_type": type(e).__name__,
-            "solutions": [],
-            "total_extracted": 0,
-            "conversations_processed": 0,
-            "extraction_summary": f"提取失败: {error_msg}",
-            "extraction_parameters": {
+        response = _EXTRACT_ERROR_TEMPLATE.copy()
+        response.update(
+            error=error_msg,
+            error_type=type(e).__name__,
+            solutions=[],
+            extraction_summary=f"提取失败: {error_msg}",
+            extraction_parameters={
                 "conversation_id": conversation_id,
                 "extract_type": extract_type,
                 "min_reusability_score": min_reusability_score,
                 "save_solutions": save_solutions,
                 "overwrite_existing": overwrite_existing
             },
-            "processing_time_ms": 0,
-            "extracted_at": datetime.now().isoformat(),
-            "extraction_engine": "synapse_solution_extractor_v1.0"
-        }
+            extracted_at=_fast_iso()
+        )
+        return response
 
 # ==================== 主入口函数 ====================
 
@@ -1752,7 +1839,10 @@ async def main():
     try:
         # 运行FastMCP服务器
         # 默认使用stdio传输方式，这是MCP的标准连接方式
-        mcp.run()
+        # 直接在当前事件循环中运行，使sync_main选择的事件循环（uvloop）生效。
+        # FastMCP没有提供替换stdio读取/解析逻辑的公开接口，大消息的读取和解析
+        # 仍由SDK的stdio传输在事件循环中完成
+        await mcp.run_stdio_async()
         
     except KeyboardInterrupt:
         logger.info("接收到中断信号，正在关闭服务器...")
@@ -1765,9 +1855,14 @@ def sync_main():
     Synchronous version of main entry point for compatibility.
     
     This function provides a synchronous interface to start the async server.
+    Uses the uvloop event loop when it is installed, falling back to the
+    default asyncio loop otherwise (e.g. on Windows).
     """
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nServer stopped")
     except Exception as e:
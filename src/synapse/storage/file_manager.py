@@ -16,23 +16,45 @@ JSON文件存储和目录管理系统 for Synapse MCP.
 - 错误恢复：完整的异常处理和错误恢复机制
 """
 
+import atexit
+import errno
+import fnmatch
 import json
+import mmap
 import os
+import re
 try:
     import fcntl
 except ImportError:
     # fcntl is not available on Windows
     fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    # msvcrt is only available on Windows
+    msvcrt = None
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json module
+    orjson = None
 import shutil
+import subprocess
+import sys
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Any, Union
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 import tempfile
 import logging
 import time
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from pydantic import BaseModel, ValidationError
 
 from synapse.storage.paths import StoragePaths
 from synapse.models.conversation import ConversationRecord, Solution
@@ -40,6 +62,466 @@ from synapse.models.conversation import ConversationRecord, Solution
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 经_fix_conversation_data迁移后写回的对话文件所标记的数据版本
+_SCHEMA_VERSION = 2
+
+# 索引文件的“读取-合并-写回”在进程内串行执行，避免多个FileManager实例的写回相互覆盖
+_index_write_lock = threading.Lock()
+
+# 对话ID中的创建日期：conv_YYYYMMDD_xxx
+_CONVERSATION_ID_DATE = re.compile(r"^conv_(\d{4})(\d{2})\d{2}_")
+
+# 旧数据中缺少language的代码解决方案的语言推断规则，按分组顺序决定优先级。
+# 零宽前瞻使每个位置都参与匹配，一次扫描即可找到优先级最高的语言
+_LANGUAGE_HINTS = re.compile(
+    r"(?=(?P<bash>npx|npm|yarn)"
+    r"|(?P<python>def |import |python)"
+    r"|(?P<javascript>function|const |let )"
+    r"|(?P<php><\?php|php)"
+    r"|(?P<c>#include|int main)"
+    r"|(?P<java>public class|java))",
+    re.IGNORECASE
+)
+_LANGUAGE_NAMES = tuple(_LANGUAGE_HINTS.groupindex)
+_LANGUAGE_PRIORITY = {name: index for index, name in enumerate(_LANGUAGE_NAMES)}
+
+
+def _infer_language(content: str) -> str:
+    """根据内容中的关键字推断代码语言，无法推断时返回 'shell'"""
+    best = None
+    for match in _LANGUAGE_HINTS.finditer(content):
+        priority = _LANGUAGE_PRIORITY[match.lastgroup]
+        if best is None or priority < best:
+            best = priority
+            if priority == 0:
+                break
+    return _LANGUAGE_NAMES[best] if best is not None else 'shell'
+
+
+# 并行读取文件的共享线程池（首次使用时创建）
+_io_executor = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """获取共享的文件读取线程池"""
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) * 4),
+                    thread_name_prefix="synapse-io"
+                )
+    return _io_executor
+
+
+if msvcrt is not None:
+    import ctypes
+    from ctypes import wintypes
+    
+    class _OVERLAPPED(ctypes.Structure):
+        _fields_ = [
+            ("Internal", ctypes.c_void_p),
+            ("InternalHigh", ctypes.c_void_p),
+            ("Offset", wintypes.DWORD),
+            ("OffsetHigh", wintypes.DWORD),
+            ("hEvent", wintypes.HANDLE),
+        ]
+    
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.LockFileEx.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.DWORD,
+        wintypes.DWORD, wintypes.DWORD, ctypes.POINTER(_OVERLAPPED)
+    ]
+    _kernel32.LockFileEx.restype = wintypes.BOOL
+    _kernel32.UnlockFileEx.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD,
+        wintypes.DWORD, wintypes.DWORD, ctypes.POINTER(_OVERLAPPED)
+    ]
+    _kernel32.UnlockFileEx.restype = wintypes.BOOL
+    
+    _LOCKFILE_FAIL_IMMEDIATELY = 0x01
+    _LOCKFILE_EXCLUSIVE_LOCK = 0x02
+    _ERROR_LOCK_VIOLATION = 33
+
+
+def _win_lock(file_obj, exclusive: bool) -> None:
+    """
+    使用LockFileEx锁定整个文件（仅Windows）
+    
+    先尝试立即获取；被其他进程占用时改为阻塞等待，由内核在锁释放时唤醒，无需轮询。
+    
+    Args:
+        file_obj: 已打开的文件对象
+        exclusive: True为排他锁（写），False为共享锁（读）
+    """
+    handle = msvcrt.get_osfhandle(file_obj.fileno())
+    flags = _LOCKFILE_EXCLUSIVE_LOCK if exclusive else 0
+    
+    if _kernel32.LockFileEx(handle, flags | _LOCKFILE_FAIL_IMMEDIATELY, 0,
+                            0xFFFFFFFF, 0xFFFFFFFF, ctypes.byref(_OVERLAPPED())):
+        return
+    
+    error = ctypes.get_last_error()
+    if error != _ERROR_LOCK_VIOLATION:
+        raise ctypes.WinError(error)
+    
+    if not _kernel32.LockFileEx(handle, flags, 0,
+                                0xFFFFFFFF, 0xFFFFFFFF, ctypes.byref(_OVERLAPPED())):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def _win_unlock(file_obj) -> None:
+    """释放_win_lock获取的文件锁（仅Windows）"""
+    handle = msvcrt.get_osfhandle(file_obj.fileno())
+    if not _kernel32.UnlockFileEx(handle, 0, 0xFFFFFFFF, 0xFFFFFFFF, ctypes.byref(_OVERLAPPED())):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+# 内核复制不可用时应回退到用户态复制的错误码（跨设备、文件系统或平台不支持）
+_KERNEL_COPY_FALLBACK_ERRNOS = frozenset(
+    code for code in (
+        errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF,
+        getattr(errno, "EOPNOTSUPP", None), getattr(errno, "ENOTSUP", None),
+    ) if code is not None
+)
+
+
+# 并行复制的文件数超过该值时，复制后释放源文件的页缓存（导入树通常不会再被读取）
+_DROP_CACHE_MIN_FILES = 1000
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """向内核提示文件的访问方式，平台不支持时忽略"""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _kernel_copy(src: str, dst: str, drop_cache: bool = False) -> bool:
+    """
+    在内核中完成文件数据复制
+    
+    依次尝试os.copy_file_range（Linux，reflink文件系统上直接克隆数据块）和os.sendfile，
+    从上一步停下的偏移继续；两者均不可用时返回False，由调用方回退到shutil。
+    复制前以 POSIX_FADV_SEQUENTIAL/WILLNEED 提示内核预读源文件，
+    drop_cache为True时复制后以 POSIX_FADV_DONTNEED 释放其页缓存。
+    
+    Returns:
+        bool: 数据是否已完整复制
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    sendfile = getattr(os, "sendfile", None) if sys.platform.startswith("linux") else None
+    if copy_file_range is None and sendfile is None:
+        return False
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(in_fd).st_size
+        _fadvise(in_fd, "POSIX_FADV_SEQUENTIAL")
+        _fadvise(in_fd, "POSIX_FADV_WILLNEED")
+        offset = 0
+        if copy_file_range is not None:
+            try:
+                while offset < size:
+                    copied = copy_file_range(in_fd, out_fd, size - offset)
+                    if copied == 0:
+                        break
+                    offset += copied
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                    raise
+        if offset < size and sendfile is not None:
+            try:
+                while offset < size:
+                    sent = sendfile(out_fd, in_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                    raise
+        if drop_cache:
+            _fadvise(in_fd, "POSIX_FADV_DONTNEED")
+        return offset >= size
+
+
+def _fast_copy(src: str, dst: str, *, follow_symlinks: bool = True, drop_cache: bool = False) -> str:
+    """
+    复制文件，供shutil.copytree作为copy_function使用
+    
+    优先通过_kernel_copy在内核中完成复制，平台不支持或调用失败时回退到shutil.copy2
+    （macOS上shutil.copy2本身即使用fcopyfile）。drop_cache见_kernel_copy。
+    """
+    if follow_symlinks or not os.path.islink(src):
+        try:
+            if _kernel_copy(src, dst, drop_cache):
+                shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+                return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+
+def _parallel_copytree(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    workers: int = 8,
+    imported: Optional[Set[Tuple[str, int, int]]] = None,
+    key_prefix: str = "",
+    exclude: FrozenSet[str] = frozenset()
+) -> None:
+    """
+    并行复制目录树，语义同 shutil.copytree(src, dst, dirs_exist_ok=True)
+    
+    先遍历一次源目录并创建所有目标目录，再将逐个文件的复制提交到线程池；
+    任一文件复制失败时取消尚未开始的任务并抛出该异常。
+    
+    提供imported时，(key_prefix + 相对路径, mtime_ns, size) 已在集合中、且目标文件仍存在
+    并与源文件大小和修改时间一致（复制时会保留修改时间）的文件直接跳过；目标被删除或
+    修改过的文件重新复制。复制成功的文件加入集合。
+    
+    Args:
+        src: 源目录
+        dst: 目标目录
+        workers: 并行复制的线程数
+        imported: 已导入文件的记录集合（可选）
+        key_prefix: 记录键中相对路径的前缀
+        exclude: 不复制的文件（相对src的路径，以/分隔）
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    
+    copies = []
+    for dir_path, _, file_names in os.walk(src, followlinks=True):
+        rel_dir = os.path.relpath(dir_path, src)
+        target_dir = os.path.join(dst, rel_dir)
+        os.makedirs(target_dir, exist_ok=True)
+        for name in file_names:
+            rel_path = os.path.normpath(os.path.join(rel_dir, name)).replace(os.sep, "/")
+            if rel_path in exclude:
+                continue
+            source = os.path.join(dir_path, name)
+            target = os.path.join(target_dir, name)
+            key = None
+            if imported is not None:
+                st = os.stat(source)
+                key = (key_prefix + rel_path, st.st_mtime_ns, st.st_size)
+                if key in imported and _same_file_stat(target, st):
+                    continue
+            copies.append((source, target, key))
+    
+    if not copies:
+        return
+    
+    drop_cache = len(copies) > _DROP_CACHE_MIN_FILES
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="synapse-copy") as executor:
+        futures = {
+            executor.submit(_fast_copy, source, target, drop_cache=drop_cache): key
+            for source, target, key in copies
+        }
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        error = None
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                error = error or exc
+            elif imported is not None:
+                imported.add(futures[future])
+        if error is not None:
+            raise error
+
+
+def _same_file_stat(path: str, st: os.stat_result) -> bool:
+    """判断path处的文件是否存在且大小和修改时间与st一致"""
+    try:
+        target_st = os.stat(path)
+    except OSError:
+        return False
+    return target_st.st_size == st.st_size and target_st.st_mtime_ns == st.st_mtime_ns
+
+
+def _tree_import_keys(src: Union[str, Path], key_prefix: str = "") -> Set[Tuple[str, int, int]]:
+    """计算目录树下所有文件的导入记录键，格式同 _parallel_copytree"""
+    src = os.fspath(src)
+    keys = set()
+    for dir_path, _, file_names in os.walk(src, followlinks=True):
+        rel_dir = os.path.relpath(dir_path, src)
+        for name in file_names:
+            st = os.stat(os.path.join(dir_path, name))
+            rel_path = os.path.normpath(os.path.join(rel_dir, name)).replace(os.sep, "/")
+            keys.add((key_prefix + rel_path, st.st_mtime_ns, st.st_size))
+    return keys
+
+
+def _fast_rmtree(path: Union[str, Path], wait: bool = True) -> None:
+    """
+    删除目录树
+    
+    先将目录重命名为同级的临时名称（O(1)，原路径立即可用），再交给系统命令
+    （POSIX 上为 rm -rf，Windows 上为 rd /s /q）删除。wait为False时不等待删除完成，
+    由后台守护线程回收子进程并在删除失败时回退到 shutil.rmtree。
+    重命名失败时原地同步删除；系统命令不可用或删除失败时回退到 shutil.rmtree。
+    
+    Args:
+        path: 要删除的目录
+        wait: 是否等待删除完成
+    """
+    path = os.fspath(path)
+    trash_path = f"{path}.trash-{os.getpid()}-{time.time_ns()}"
+    try:
+        os.rename(path, trash_path)
+    except OSError:
+        trash_path = path
+        wait = True
+    
+    if os.name == 'nt':
+        command = ["cmd", "/c", "rd", "/s", "/q", trash_path]
+    else:
+        command = ["rm", "-rf", trash_path]
+    
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logger.debug(f"无法执行删除命令，回退到shutil.rmtree: {e}")
+        shutil.rmtree(trash_path)
+        return
+    
+    if not wait:
+        threading.Thread(
+            target=_reap_rmtree, args=(process, trash_path),
+            name="synapse-rmtree", daemon=True
+        ).start()
+        return
+    if process.wait() != 0 or os.path.exists(trash_path):
+        shutil.rmtree(trash_path)
+
+
+def _reap_rmtree(process: subprocess.Popen, trash_path: str) -> None:
+    """
+    等待后台删除命令结束并回收子进程，命令失败时用 shutil.rmtree 补删
+    
+    Args:
+        process: 删除命令的子进程
+        trash_path: 正在删除的目录
+    """
+    if process.wait() != 0 or os.path.exists(trash_path):
+        logger.warning(f"后台删除命令未能删除目录，回退到shutil.rmtree: {trash_path}")
+        shutil.rmtree(trash_path, ignore_errors=True)
+
+
+def _purge_trash(directory: Union[str, Path]) -> None:
+    """
+    在后台删除目录下遗留的 *.trash-* 目录
+    
+    _fast_rmtree 在进程退出或崩溃前未删完的临时目录会一直留在原位置；
+    当前进程自己正在删除的目录（名称中的pid为本进程）跳过。
+    
+    Args:
+        directory: 要清理的父目录
+    """
+    own_marker = f".trash-{os.getpid()}-"
+    try:
+        with os.scandir(directory) as entries:
+            stale = [
+                entry.path for entry in entries
+                if ".trash-" in entry.name and own_marker not in entry.name
+                and entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+    
+    for path in stale:
+        threading.Thread(
+            target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True},
+            name="synapse-purge-trash", daemon=True
+        ).start()
+
+
+def _dump_json_bytes(data: Any, pretty: bool = False) -> bytes:
+    """
+    将数据编码为UTF-8 JSON字节串
+    
+    默认输出紧凑格式以减少写入和读取的字节数；pretty为True时使用2空格缩进。
+    pydantic模型由pydantic-core直接序列化，不经过中间字典；
+    其他数据优先使用orjson（一次性生成bytes，无中间字符串），不可用时回退到标准库json。
+    datetime/date输出ISO格式，其他无法直接序列化的对象（如Path）转为字符串。
+    """
+    if isinstance(data, BaseModel):
+        return data.model_dump_json(indent=2 if pretty else None).encode('utf-8')
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, default=str, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _json_default(obj: Any) -> str:
+    """标准库json的回退序列化，与orjson保持一致：日期时间输出ISO格式，其余转为字符串"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _write_atomic(file_path: Path, payload: bytes, sync: bool = True) -> None:
+    """
+    原子性写入文件内容
+    
+    先写入同目录下的临时文件，再通过os.replace换入目标路径，写入中途崩溃不会留下
+    截断的文件；失败时删除临时文件并抛出异常。sync为True时在替换前fsync临时文件。
+    
+    Args:
+        file_path: 目标文件路径
+        payload: 文件内容
+        sync: 是否在替换前同步到磁盘
+    """
+    with tempfile.NamedTemporaryFile(
+        mode='wb',
+        suffix='.tmp',
+        prefix=file_path.stem + '_',
+        dir=file_path.parent,
+        delete=False
+    ) as temp_file:
+        temp_path = Path(temp_file.name)
+        try:
+            temp_file.write(payload)
+            if sync:
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+        except BaseException:
+            temp_file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    try:
+        temp_path.replace(file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _load_json(text: Union[str, bytes]) -> Any:
+    """解析JSON文本，优先使用orjson"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _load_json_buffer(buffer: Any) -> Any:
+    """从支持缓冲区协议的对象（如mmap）解析JSON，orjson可直接读取而无需先复制"""
+    if orjson is not None:
+        with memoryview(buffer) as view:
+            return orjson.loads(view)
+    return json.loads(buffer[:])
+
 
 @dataclass
 class StorageStats:
@@ -62,6 +544,67 @@ class BackupInfo:
     size_bytes: int
 
 
+class _RWLock:
+    """
+    读写锁：多个读者可并发持有，写者独占
+    
+    有写者等待时不再接纳新的读者，避免写者饥饿。
+    """
+    __slots__ = ("_cond", "_readers", "_writer", "_waiting_writers")
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    
+    def acquire(self, exclusive: bool, timeout: float) -> bool:
+        """
+        获取读锁或写锁
+        
+        Args:
+            exclusive: True获取写锁，False获取读锁
+            timeout: 超时时间（秒）
+            
+        Returns:
+            bool: 是否在超时前获取成功
+        """
+        with self._cond:
+            if not exclusive:
+                if not self._cond.wait_for(lambda: not self._writer and not self._waiting_writers, timeout):
+                    return False
+                self._readers += 1
+                return True
+            
+            self._waiting_writers += 1
+            acquired = self._cond.wait_for(lambda: not self._writer and not self._readers, timeout)
+            self._waiting_writers -= 1
+            if acquired:
+                self._writer = True
+            else:
+                # 放弃等待后唤醒被本写者挡住的读者
+                self._cond.notify_all()
+            return acquired
+    
+    def release(self, exclusive: bool) -> None:
+        """释放acquire获取的锁"""
+        with self._cond:
+            if exclusive:
+                self._writer = False
+            else:
+                self._readers -= 1
+            self._cond.notify_all()
+
+
+class _LockHolder:
+    """按文件路径共享的读写锁，引用计数归零时从缓存中移除"""
+    __slots__ = ("lock", "refcount")
+    
+    def __init__(self):
+        self.lock = _RWLock()
+        self.refcount = 0
+
+
 class FileManager:
     """
     JSON文件存储和目录管理器
@@ -88,6 +631,12 @@ class FileManager:
         loaded = await file_manager.load_conversation(conversation.id)
     """
     
+    # 内存索引属性名 -> indexes目录下的文件名
+    _INDEX_FILES = {
+        "_id_index": "conversation_index.json",
+        "_ref_counts": "solution_refcounts.json",
+    }
+    
     def __init__(self, storage_paths: StoragePaths):
         """
         初始化FileManager
@@ -96,9 +645,37 @@ class FileManager:
             storage_paths: StoragePaths实例，用于路径管理
         """
         self.storage_paths = storage_paths
+        self._conversations_dir = str(storage_paths.get_conversations_dir())
         self.lock_timeout = 30.0  # 文件锁超时时间（秒）
-        self._file_locks = {}  # 文件锁缓存
+        self._file_locks = {}  # 文件锁缓存（只保留正在使用的路径）
         self._lock_mutex = threading.Lock()  # 线程锁
+        self._known_dirs = set()  # 已确认存在的目录，避免重复mkdir
+        
+        # 大目录导入时是否使用系统原生复制工具（config.json 中 storage.fast_copy）
+        self.fast_copy = bool(self._read_storage_setting("fast_copy", True))
+        self.fast_copy_min_files = 500
+        self.fast_copy_min_bytes = 50 * 1024 * 1024
+        
+        # 延迟fsync（组提交）：写入完成后登记文件，由后台线程按批同步到磁盘
+        self.sync_interval = 0.05  # 批量同步间隔（秒）
+        self._pending_sync = set()  # 待同步的文件路径
+        self._sync_cond = threading.Condition()  # 保护待同步集合并唤醒同步线程
+        self._sync_lock = threading.Lock()  # 保证同一时刻只有一批同步在执行
+        self._sync_thread = None
+        
+        # 对话ID -> 相对路径索引（相对conversations目录），首次使用时加载
+        self._id_index = None
+        # 解决方案ID -> [引用计数, 最后引用时间]，覆盖解决方案文件中的值
+        self._ref_counts = None
+        # 尚未写回的索引改动：索引属性名 -> {键: 新值}，值为None表示删除该键
+        self._dirty_indexes: Dict[str, Dict[str, Any]] = {}
+        self._index_lock = threading.Lock()
+        
+        # 存储统计缓存，经由本实例的写入/删除/导入操作后失效
+        self._stats_cache = None
+        
+        # 导入源路径 -> 已导入文件记录，首次导入时加载
+        self._import_cache = None
         
         # 确保必要的目录存在
         self._ensure_directories()
@@ -116,17 +693,147 @@ class FileManager:
         for directory in directories:
             self.storage_paths.create_directory(directory)
     
+    def _read_storage_setting(self, key: str, default: Any) -> Any:
+        """
+        读取 config.json 中 storage 段的配置项
+        
+        Args:
+            key: 配置项名称
+            default: 配置文件或配置项不存在时的默认值
+        """
+        config_file = self.storage_paths.get_config_dir() / "config.json"
+        try:
+            with open(config_file, 'rb') as f:
+                return _load_json(f.read()).get("storage", {}).get(key, default)
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.warning(f"读取存储配置失败 {config_file}: {e}")
+            return default
+    
+    def _is_large_tree(self, root: Path) -> bool:
+        """判断目录的文件数或总大小是否超过原生复制的阈值，超过后立即停止统计"""
+        file_count = 0
+        total_size = 0
+        for dir_path, _, file_names in os.walk(root):
+            for name in file_names:
+                file_count += 1
+                try:
+                    total_size += os.path.getsize(os.path.join(dir_path, name))
+                except OSError:
+                    pass
+                if file_count > self.fast_copy_min_files or total_size > self.fast_copy_min_bytes:
+                    return True
+        return False
+    
+    def _fast_copytree(
+        self,
+        src: Path,
+        dst: Path,
+        imported: Optional[Set[Tuple[str, int, int]]] = None,
+        key_prefix: str = "",
+        exclude: FrozenSet[str] = frozenset()
+    ) -> None:
+        """
+        复制目录树（合并到已有目录）
+        
+        大目录在启用 fast_copy 时交给系统原生工具（Windows 上为 robocopy /MT，
+        其他平台为 cp -a）；工具不可用或执行失败时回退到线程池并行复制。
+        已有导入记录或需要排除文件时逐个文件处理，不使用原生工具。
+        
+        Args:
+            src: 源目录
+            dst: 目标目录
+            imported: 已导入文件的记录集合（见 _parallel_copytree）
+            key_prefix: 记录键中相对路径的前缀
+            exclude: 不复制的文件（见 _parallel_copytree）
+        """
+        if self.fast_copy and not imported and not exclude and self._is_large_tree(src):
+            dst.mkdir(parents=True, exist_ok=True)
+            try:
+                if os.name == 'nt':
+                    result = subprocess.run(
+                        ["robocopy", str(src), str(dst), "/MT:16", "/E", "/NFL", "/NDL", "/NJH", "/NJS"],
+                        capture_output=True, check=False
+                    )
+                    # robocopy 返回码 0-7 表示成功，8 及以上表示有文件复制失败
+                    succeeded = result.returncode <= 7
+                else:
+                    result = subprocess.run(
+                        ["cp", "-a", f"{src}{os.sep}.", str(dst)],
+                        capture_output=True, check=False
+                    )
+                    succeeded = result.returncode == 0
+                
+                if succeeded:
+                    if imported is not None:
+                        imported.update(_tree_import_keys(src, key_prefix))
+                    return
+                logger.warning(f"原生复制失败（返回码 {result.returncode}），回退到并行复制: {src}")
+            except OSError as e:
+                logger.warning(f"无法执行原生复制工具，回退到并行复制: {e}")
+        
+        _parallel_copytree(src, dst, imported=imported, key_prefix=key_prefix, exclude=exclude)
+    
+    def _get_import_cache(self) -> Dict[str, Set[Tuple[str, int, int]]]:
+        """
+        获取导入记录，首次调用时从缓存目录加载
+        
+        记录按导入源路径保存已复制文件的 (相对路径, mtime_ns, size)，
+        追加模式重复导入同一来源时跳过未变化的文件。缓存文件缺失或损坏时从空记录开始。
+        
+        Returns:
+            Dict[str, Set[Tuple[str, int, int]]]: 导入源路径到已导入文件记录的映射
+        """
+        if self._import_cache is None:
+            cache_path = self.storage_paths.get_cache_dir() / "import_cache.json"
+            try:
+                with open(cache_path, 'rb') as f:
+                    raw = _load_json(f.read())
+                self._import_cache = {
+                    source: {tuple(entry) for entry in entries}
+                    for source, entries in raw.items()
+                }
+            except FileNotFoundError:
+                self._import_cache = {}
+            except Exception as e:
+                logger.warning(f"加载导入记录失败，将重新记录: {e}")
+                self._import_cache = {}
+        return self._import_cache
+    
+    def _save_import_cache(self) -> None:
+        """将导入记录写回缓存目录"""
+        if self._import_cache is None:
+            return
+        cache_path = self.storage_paths.get_cache_dir() / "import_cache.json"
+        data = {source: sorted(entries) for source, entries in self._import_cache.items()}
+        self._atomic_write_json(cache_path, data, backup=False)
+    
+    def _ensure_dir(self, directory: Path) -> None:
+        """
+        确保目录存在，已确认存在的目录直接跳过
+        
+        Args:
+            directory: 目录路径
+        """
+        key = str(directory)
+        if key in self._known_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self._known_dirs.add(key)
+    
     @contextmanager
-    def _file_lock(self, file_path: Path, mode: str = 'r'):
+    def _file_lock(self, file_path: Path, mode: str = 'r', buffering: int = -1):
         """
         文件锁上下文管理器
         
         提供跨平台的文件锁定机制，防止并发访问冲突。
-        在Unix系统使用fcntl，在Windows系统使用msvcrt。
+        在Unix系统使用fcntl，在Windows系统使用LockFileEx。
         
         Args:
             file_path: 要锁定的文件路径
-            mode: 文件打开模式 ('r', 'w', 'a')
+            mode: 文件打开模式 ('r', 'w', 'a'，加 'b' 为二进制模式)
+            buffering: 传给open()的缓冲策略，二进制模式下为0时直接读写底层文件
         
         Yields:
             file: 打开并锁定的文件对象
@@ -136,60 +843,63 @@ class FileManager:
             OSError: 文件操作失败
         """
         lock_key = str(file_path.absolute())
+        exclusive = 'w' in mode or 'a' in mode
         
         with self._lock_mutex:
-            if lock_key not in self._file_locks:
-                self._file_locks[lock_key] = threading.Lock()
-            file_lock = self._file_locks[lock_key]
-        
-        # 获取线程锁
-        if not file_lock.acquire(timeout=self.lock_timeout):
-            raise TimeoutError(f"获取文件锁超时: {file_path}")
+            holder = self._file_locks.get(lock_key)
+            if holder is None:
+                holder = self._file_locks[lock_key] = _LockHolder()
+            holder.refcount += 1
         
         try:
-            # 确保父目录存在
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 打开文件
-            file_obj = open(file_path, mode, encoding='utf-8')
+            # 获取线程锁：读操作共享，写操作独占
+            if not holder.lock.acquire(exclusive, self.lock_timeout):
+                raise TimeoutError(f"获取文件锁超时: {file_path}")
             
             try:
-                # 尝试获取文件系统级锁定
-                if os.name == 'posix' and fcntl:
-                    # Unix系统使用fcntl
-                    lock_type = fcntl.LOCK_EX if 'w' in mode or 'a' in mode else fcntl.LOCK_SH
-                    fcntl.flock(file_obj.fileno(), lock_type | fcntl.LOCK_NB)
-                elif os.name == 'nt':
-                    # Windows系统使用msvcrt
-                    import msvcrt
-                    start_time = time.time()
-                    while time.time() - start_time < self.lock_timeout:
-                        try:
-                            msvcrt.locking(file_obj.fileno(), msvcrt.LK_NBLCK, 1)
-                            break
-                        except OSError:
-                            time.sleep(0.1)
-                    else:
-                        raise TimeoutError(f"Windows文件锁超时: {file_path}")
+                # 确保父目录存在
+                self._ensure_dir(file_path.parent)
                 
-                yield file_obj
+                # 打开文件
+                file_obj = open(
+                    file_path, mode, buffering=buffering,
+                    encoding=None if 'b' in mode else 'utf-8'
+                )
                 
-            finally:
-                # 释放文件系统级锁定
-                if os.name == 'posix' and fcntl:
-                    fcntl.flock(file_obj.fileno(), fcntl.LOCK_UN)
-                elif os.name == 'nt':
-                    import msvcrt
-                    try:
-                        msvcrt.locking(file_obj.fileno(), msvcrt.LK_UNLCK, 1)
-                    except OSError:
-                        pass  # 忽略解锁错误
+                try:
+                    # 尝试获取文件系统级锁定
+                    if os.name == 'posix' and fcntl:
+                        # Unix系统使用fcntl
+                        lock_type = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                        fcntl.flock(file_obj.fileno(), lock_type | fcntl.LOCK_NB)
+                    elif msvcrt is not None:
+                        # Windows系统使用LockFileEx锁定整个文件，读操作使用共享锁
+                        _win_lock(file_obj, exclusive=exclusive)
+                    
+                    yield file_obj
                 
-                file_obj.close()
+                finally:
+                    # 释放文件系统级锁定
+                    if os.name == 'posix' and fcntl:
+                        fcntl.flock(file_obj.fileno(), fcntl.LOCK_UN)
+                    elif msvcrt is not None:
+                        try:
+                            _win_unlock(file_obj)
+                        except OSError:
+                            pass  # 忽略解锁错误
+                    
+                    file_obj.close()
+            
+            finally:
+                # 释放线程锁
+                holder.lock.release(exclusive)
         
         finally:
-            # 释放线程锁
-            file_lock.release()
+            # 没有其他线程使用该路径时移除锁，避免缓存无限增长
+            with self._lock_mutex:
+                holder.refcount -= 1
+                if holder.refcount == 0:
+                    del self._file_locks[lock_key]
     
     def _get_conversation_file_path(self, conversation_id: str, date_obj: Optional[date] = None) -> Path:
         """
@@ -208,8 +918,29 @@ class FileManager:
         if date_obj is None:
             date_obj = datetime.now().date()
         
-        year_month_dir = self.storage_paths.get_conversations_dir() / str(date_obj.year) / f"{date_obj.month:02d}"
-        return year_month_dir / f"{conversation_id}.json"
+        return self._conv_path(self._conversations_dir, date_obj.year, date_obj.month, conversation_id)
+    
+    def _path_from_id(self, conversation_id: str) -> Optional[Path]:
+        """
+        根据对话ID中编码的日期推算文件路径
+        
+        Args:
+            conversation_id: 对话ID，格式为 conv_YYYYMMDD_xxx
+            
+        Returns:
+            Path: 推算出的文件路径；ID不符合该格式时返回None
+        """
+        match = _CONVERSATION_ID_DATE.match(conversation_id)
+        if match is None:
+            return None
+        return self._conv_path(self._conversations_dir, int(match.group(1)), int(match.group(2)), conversation_id)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _conv_path(conversations_dir: str, year: int, month: int, conversation_id: str) -> Path:
+        """按 (目录, 年, 月, ID) 缓存对话文件路径，同一对话的保存/加载/删除复用同一个Path"""
+        # 用字符串拼接路径，只在返回时构造一次Path
+        return Path(os.path.join(conversations_dir, str(year), f"{month:02d}", f"{conversation_id}.json"))
     
     def _get_solution_file_path(self, solution_id: str) -> Path:
         """
@@ -230,6 +961,9 @@ class FileManager:
         在修改文件前创建备份，以防写入失败时数据丢失。
         备份文件存储在backups目录中。
         
+        优先创建硬链接而不是复制数据：写入通过os.replace换入新文件，
+        旧inode由备份链接继续持有，因此备份内容仍是写入前的版本。
+        
         Args:
             file_path: 要备份的文件路径
             
@@ -245,16 +979,22 @@ class FileManager:
             backup_path = backups_dir / backup_name
             
             # 创建备份目录
-            backup_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(backup_path.parent)
+            
+            # 同一秒内的重复备份覆盖旧备份（与复制方式的行为一致）
+            backup_path.unlink(missing_ok=True)
             
-            # 复制文件
-            shutil.copy2(file_path, backup_path)
+            # 创建硬链接，跨设备或文件系统不支持时回退到复制文件
+            try:
+                os.link(file_path, backup_path)
+            except OSError:
+                _fast_copy(str(file_path), str(backup_path))
             
             backup_info = BackupInfo(
                 backup_path=backup_path,
                 original_path=file_path,
                 created_at=datetime.now(),
-                size_bytes=backup_path.stat().st_size
+                size_bytes=file_path.stat().st_size
             )
             
             logger.debug(f"创建备份成功: {backup_path}")
@@ -276,7 +1016,12 @@ class FileManager:
         """
         try:
             if backup_info.backup_path.exists():
-                shutil.copy2(backup_info.backup_path, backup_info.original_path)
+                # 硬链接备份与原文件仍是同一inode时，原文件未被替换，无需恢复
+                if backup_info.original_path.exists() and os.path.samefile(
+                    backup_info.backup_path, backup_info.original_path
+                ):
+                    return True
+                _fast_copy(str(backup_info.backup_path), str(backup_info.original_path))
                 logger.info(f"从备份恢复成功: {backup_info.original_path}")
                 return True
             else:
@@ -310,24 +1055,22 @@ class FileManager:
                 backup_info = self._create_backup(file_path)
             
             # 确保目标目录存在
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 使用临时文件进行原子性写入
-            with tempfile.NamedTemporaryFile(
-                mode='w',
-                encoding='utf-8',
-                suffix='.tmp',
-                prefix=file_path.stem + '_',
-                dir=file_path.parent,
-                delete=False
-            ) as temp_file:
-                json.dump(data, temp_file, indent=2, ensure_ascii=False)
-                temp_file.flush()
-                os.fsync(temp_file.fileno())  # 强制写入磁盘
-                temp_path = Path(temp_file.name)
+            self._ensure_dir(file_path.parent)
             
-            # 原子性重命名
-            temp_path.replace(file_path)
+            # 使用临时文件和重命名进行原子性写入，fsync交给后台线程
+            payload = _dump_json_bytes(data)
+            try:
+                _write_atomic(file_path, payload, sync=False)
+            except FileNotFoundError:
+                # 目录可能已被其他FileManager实例移走（如覆盖导入），目录缓存随之失效：
+                # 丢弃缓存条目，重建目录后重试一次
+                self._known_dirs.discard(str(file_path.parent))
+                self._ensure_dir(file_path.parent)
+                _write_atomic(file_path, payload, sync=False)
+            self._stats_cache = None
+            
+            # 由后台线程批量fsync，避免每次写入都等待一次磁盘屏障
+            self._schedule_sync(file_path)
             
             logger.debug(f"JSON文件写入成功: {file_path}")
             return True
@@ -339,15 +1082,253 @@ class FileManager:
             if backup_info:
                 self._restore_from_backup(backup_info)
             
-            # 清理临时文件
-            try:
-                if 'temp_path' in locals() and temp_path.exists():
-                    temp_path.unlink()
-            except Exception:
-                pass
-            
             return False
     
+    def _schedule_sync(self, file_path: Path) -> None:
+        """
+        登记需要同步到磁盘的文件
+        
+        首次调用时启动后台同步线程，并注册进程退出时的 flush。
+        
+        Args:
+            file_path: 已写入完成的文件路径
+        """
+        with self._sync_cond:
+            self._pending_sync.add(file_path)
+            self._start_sync_thread()
+            self._sync_cond.notify()
+    
+    def _start_sync_thread(self) -> None:
+        """启动后台同步线程（调用方需持有 _sync_cond）"""
+        if self._sync_thread is None:
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, name="synapse-fsync", daemon=True
+            )
+            self._sync_thread.start()
+            atexit.register(self.flush)
+    
+    def _sync_loop(self) -> None:
+        """后台同步线程：等待新的写入，合并一个同步间隔内的所有写入后统一fsync"""
+        while True:
+            with self._sync_cond:
+                while not self._pending_sync and not self._dirty_indexes:
+                    self._sync_cond.wait()
+            time.sleep(self.sync_interval)
+            self.flush()
+    
+    def flush(self) -> None:
+        """
+        将所有已登记的写入立即同步到磁盘
+        
+        先写出有改动的索引，然后依次fsync每个文件，
+        再对涉及的目录各fsync一次，使重命名操作持久化。
+        返回时，调用前完成的所有写入均已落盘。
+        """
+        with self._sync_lock:
+            self._save_indexes()
+            with self._sync_cond:
+                paths, self._pending_sync = self._pending_sync, set()
+            
+            directories = set()
+            # Windows上fsync（FlushFileBuffers）需要写权限
+            flags = os.O_RDONLY if os.name == 'posix' else os.O_RDWR
+            for path in paths:
+                try:
+                    fd = os.open(path, flags)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                    directories.add(path.parent)
+                except OSError as e:
+                    # 文件可能已被删除或再次替换，后者会重新登记
+                    logger.debug(f"同步文件失败 {path}: {e}")
+            
+            # 目录fsync仅在POSIX系统上可用
+            if os.name == 'posix':
+                for directory in directories:
+                    try:
+                        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                        try:
+                            os.fsync(fd)
+                        finally:
+                            os.close(fd)
+                    except OSError as e:
+                        logger.debug(f"同步目录失败 {directory}: {e}")
+    
+    def _get_id_index_path(self) -> Path:
+        """获取对话ID索引文件路径"""
+        return self.storage_paths.get_indexes_dir() / self._INDEX_FILES["_id_index"]
+    
+    def _get_id_index(self) -> Dict[str, str]:
+        """
+        获取对话ID索引，首次调用时从磁盘加载
+        
+        索引文件缺失或损坏时遍历年月目录重建，并在下次同步时写回。
+        
+        Returns:
+            Dict[str, str]: 对话ID到相对路径（相对conversations目录）的映射
+        """
+        with self._index_lock:
+            if self._id_index is not None:
+                return self._id_index
+            
+            index_path = self._get_id_index_path()
+            try:
+                with open(index_path, 'rb') as f:
+                    index = _load_json(f.read())
+                if not isinstance(index, dict):
+                    raise ValueError("索引格式无效")
+                self._id_index = index
+                return index
+            except FileNotFoundError:
+                logger.info("对话ID索引不存在，开始重建")
+            except Exception as e:
+                logger.warning(f"加载对话ID索引失败，开始重建: {e}")
+            
+            self._id_index = self._rebuild_id_index()
+            rebuilt = dict(self._id_index)
+        
+        self._mark_index_dirty("_id_index", rebuilt)
+        return self._id_index
+    
+    def _rebuild_id_index(self) -> Dict[str, str]:
+        """
+        遍历年月目录重建对话ID索引
+        
+        Returns:
+            Dict[str, str]: 对话ID到相对路径的映射
+        """
+        index = {}
+        conversations_dir = self.storage_paths.get_conversations_dir()
+        try:
+            for year_name, year_path in self._scan_numeric_dirs(conversations_dir):
+                for month_name, month_path in self._scan_numeric_dirs(year_path):
+                    with os.scandir(month_path) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(".json"):
+                                index[entry.name[:-5]] = f"{year_name}/{month_name}/{entry.name}"
+        except OSError as e:
+            logger.warning(f"重建对话ID索引失败: {e}")
+        
+        logger.info(f"对话ID索引重建完成: {len(index)} 条")
+        return index
+    
+    def _update_id_index(self, conversation_id: str, file_path: Optional[Path]) -> None:
+        """
+        更新对话ID索引中的一项
+        
+        Args:
+            conversation_id: 对话ID
+            file_path: 对话文件路径，为None时从索引中移除
+        """
+        index = self._get_id_index()
+        relative_path = None
+        with self._index_lock:
+            if file_path is None:
+                if index.pop(conversation_id, None) is None:
+                    return
+            else:
+                relative_path = file_path.relative_to(self.storage_paths.get_conversations_dir()).as_posix()
+                if index.get(conversation_id) == relative_path:
+                    return
+                index[conversation_id] = relative_path
+        
+        self._mark_index_dirty("_id_index", {conversation_id: relative_path})
+    
+    def _get_ref_counts(self) -> Dict[str, List[Any]]:
+        """
+        获取解决方案引用计数索引，首次调用时从磁盘加载
+        
+        Returns:
+            Dict[str, List[Any]]: 解决方案ID到 [引用计数, 最后引用时间ISO字符串] 的映射
+        """
+        with self._index_lock:
+            if self._ref_counts is None:
+                index_path = self.storage_paths.get_indexes_dir() / self._INDEX_FILES["_ref_counts"]
+                try:
+                    with open(index_path, 'rb') as f:
+                        ref_counts = _load_json(f.read())
+                    if not isinstance(ref_counts, dict):
+                        raise ValueError("索引格式无效")
+                except FileNotFoundError:
+                    ref_counts = {}
+                except Exception as e:
+                    logger.warning(f"加载解决方案引用计数失败: {e}")
+                    ref_counts = {}
+                self._ref_counts = ref_counts
+            return self._ref_counts
+    
+    def _apply_ref_count(self, solution: Solution) -> Solution:
+        """用引用计数索引中的值覆盖解决方案的引用计数和最后引用时间"""
+        entry = self._get_ref_counts().get(solution.id)
+        if entry:
+            solution.reference_count = entry[0]
+            solution.last_referenced = datetime.fromisoformat(entry[1])
+        return solution
+    
+    def _mark_index_dirty(self, name: str, changes: Dict[str, Any]) -> None:
+        """
+        登记索引的改动，由后台同步线程批量写出
+        
+        Args:
+            name: 索引属性名（_INDEX_FILES中的键）
+            changes: 改动的键及新值，值为None表示删除该键
+        """
+        with self._sync_cond:
+            self._dirty_indexes.setdefault(name, {}).update(changes)
+            self._start_sync_thread()
+            self._sync_cond.notify()
+    
+    def _save_indexes(self) -> None:
+        """
+        将索引改动合并写回磁盘
+        
+        每个FileManager实例只持有自己的内存索引，因此写回时重新读取磁盘上的索引文件，
+        只应用本实例登记的改动，不以整个内存快照覆盖其他实例写入的条目；
+        写回后用合并结果刷新内存索引，使本实例也能看到其他实例的改动。
+        """
+        with self._sync_cond:
+            dirty, self._dirty_indexes = self._dirty_indexes, {}
+        
+        for name, changes in dirty.items():
+            index_path = self.storage_paths.get_indexes_dir() / self._INDEX_FILES[name]
+            with _index_write_lock:
+                try:
+                    merged = _load_json(index_path.read_bytes())
+                    if not isinstance(merged, dict):
+                        merged = {}
+                except (OSError, ValueError):
+                    merged = {}
+                for key, value in changes.items():
+                    if value is None:
+                        merged.pop(key, None)
+                    else:
+                        merged[key] = value
+                saved = self._atomic_write_json(index_path, merged, backup=False)
+            
+            if not saved:
+                # 写回失败，改动留待下次同步（不覆盖其间登记的更新的改动）
+                with self._sync_cond:
+                    pending = self._dirty_indexes.setdefault(name, {})
+                    for key, value in changes.items():
+                        pending.setdefault(key, value)
+                continue
+            
+            with self._index_lock:
+                index = getattr(self, name)
+                if index is None:
+                    continue
+                with self._sync_cond:
+                    pending = dict(self._dirty_indexes.get(name, ()))
+                index.clear()
+                index.update(merged)
+                for key, value in pending.items():
+                    if value is None:
+                        index.pop(key, None)
+                    else:
+                        index[key] = value
+    
     def save_conversation(self, conversation: ConversationRecord) -> bool:
         """
         保存对话记录到JSON文件
@@ -368,13 +1349,11 @@ class FileManager:
                 conversation.created_at.date()
             )
             
-            # 转换为字典格式
-            conversation_data = conversation.to_dict()
-            
-            # 原子性写入
-            success = self._atomic_write_json(file_path, conversation_data)
+            # 原子性写入（模型直接序列化为JSON，与to_dict()输出格式一致）
+            success = self._atomic_write_json(file_path, conversation)
             
             if success:
+                self._update_id_index(conversation.id, file_path)
                 logger.info(f"保存对话记录成功: {conversation.id}")
             else:
                 logger.error(f"保存对话记录失败: {conversation.id}")
@@ -401,26 +1380,42 @@ class FileManager:
             file_path = self._get_conversation_file_path(conversation_id)
             
             if file_path.exists():
-                return self._load_conversation_from_file(file_path)
+                return self.load_conversation_file(file_path)
             
             # 如果需要，搜索所有日期目录
             if search_all_dates:
                 conversations_dir = self.storage_paths.get_conversations_dir()
                 
+                # 对话ID中带有生成日期，通常与存储目录的年月一致，直接定位
+                id_path = self._path_from_id(conversation_id)
+                if id_path is not None and id_path != file_path and id_path.exists():
+                    return self.load_conversation_file(id_path)
+                
+                # 其次通过ID索引定位文件
+                relative_path = self._get_id_index().get(conversation_id)
+                if relative_path:
+                    indexed_file = conversations_dir / relative_path
+                    if indexed_file.exists():
+                        return self.load_conversation_file(indexed_file)
+                    # 索引已过期（文件被外部移动或删除）
+                    self._update_id_index(conversation_id, None)
+                
+                # 索引未命中时回退到遍历目录，找到后补入索引
+                file_name = f"{conversation_id}.json"
+                
                 # 遍历年目录
-                for year_dir in conversations_dir.iterdir():
-                    if not year_dir.is_dir() or not year_dir.name.isdigit():
-                        continue
-                    
+                for _, year_path in self._scan_numeric_dirs(conversations_dir):
                     # 遍历月目录
-                    for month_dir in year_dir.iterdir():
-                        if not month_dir.is_dir():
-                            continue
-                        
+                    with os.scandir(year_path) as month_entries:
+                        month_paths = [entry.path for entry in month_entries if entry.is_dir()]
+                    
+                    for month_path in month_paths:
                         # 查找对话文件
-                        candidate_file = month_dir / f"{conversation_id}.json"
-                        if candidate_file.exists():
-                            return self._load_conversation_from_file(candidate_file)
+                        candidate = os.path.join(month_path, file_name)
+                        if os.path.exists(candidate):
+                            candidate_file = Path(candidate)
+                            self._update_id_index(conversation_id, candidate_file)
+                            return self.load_conversation_file(candidate_file)
             
             logger.debug(f"对话记录未找到: {conversation_id}")
             return None
@@ -439,36 +1434,25 @@ class FileManager:
         Returns:
             Dict[str, Any]: 修复后的对话数据
         """
+        # 已迁移的数据无需再次修复
+        if data.get('schema_version', 0) >= _SCHEMA_VERSION:
+            return data
+        
         # 修复solutions中的language字段问题
         if 'solutions' in data and isinstance(data['solutions'], list):
             for solution in data['solutions']:
                 if isinstance(solution, dict):
                     # 如果是code类型但没有language，尝试推断或设置默认值
                     if solution.get('type') == 'code' and not solution.get('language'):
-                        content = solution.get('content', '').lower()
-                        
-                        # 简单的语言推断
-                        if 'npx' in content or 'npm' in content or 'yarn' in content:
-                            solution['language'] = 'bash'
-                        elif 'def ' in content or 'import ' in content or 'python' in content:
-                            solution['language'] = 'python'
-                        elif 'function' in content or 'const ' in content or 'let ' in content:
-                            solution['language'] = 'javascript'
-                        elif '<?php' in content or 'php' in content:
-                            solution['language'] = 'php'
-                        elif '#include' in content or 'int main' in content:
-                            solution['language'] = 'c'
-                        elif 'public class' in content or 'java' in content:
-                            solution['language'] = 'java'
-                        else:
-                            # 如果无法推断，设置为通用的shell/bash
-                            solution['language'] = 'shell'
+                        # 简单的语言推断（无法推断时设置为通用的shell）
+                        solution['language'] = _infer_language(solution.get('content', ''))
                         
                         logger.info(f"修复解决方案 {solution.get('id', 'unknown')} 的语言字段: {solution['language']}")
         
+        data['schema_version'] = _SCHEMA_VERSION
         return data
     
-    def _load_conversation_from_file(self, file_path: Path) -> Optional[ConversationRecord]:
+    def load_conversation_file(self, file_path: Path) -> Optional[ConversationRecord]:
         """
         从指定文件加载对话记录
         
@@ -476,15 +1460,22 @@ class FileManager:
             file_path: 文件路径
             
         Returns:
-            ConversationRecord: 加载的对话记录
+            ConversationRecord: 加载的对话记录，文件无法读取或解析时返回None
         """
         try:
-            with self._file_lock(file_path, 'r') as f:
-                data = json.load(f)
-                
-            # 修复可能存在的数据问题
-            data = self._fix_conversation_data(data)
+            # 以无缓冲二进制模式一次读入整个文件：FileIO.readall按文件大小分配并读取，
+            # 省去缓冲区分配和UTF-8解码，解析器直接处理bytes
+            with self._file_lock(file_path, 'rb', buffering=0) as f:
+                raw = f.read()
             
+            # 快速路径：由pydantic-core直接解析并校验JSON
+            try:
+                return ConversationRecord.model_validate_json(raw)
+            except ValidationError:
+                pass
+            
+            # 旧数据可能校验失败，在内存中修复后按字典方式加载（不改写源文件）
+            data = self._fix_conversation_data(_load_json(raw))
             return ConversationRecord.from_dict(data)
                 
         except Exception as e:
@@ -518,6 +1509,8 @@ class FileManager:
                 # 创建备份后删除
                 backup_info = self._create_backup(file_path)
                 file_path.unlink()
+                self._stats_cache = None
+                self._update_id_index(conversation_id, None)
                 
                 logger.info(f"删除对话记录成功: {conversation_id}")
                 return True
@@ -541,46 +1534,76 @@ class FileManager:
         Returns:
             List[str]: 对话ID列表
         """
-        conversation_ids = []
-        
         try:
-            conversations_dir = self.storage_paths.get_conversations_dir()
+            file_paths = self.iter_conversation_files(start_date, end_date)
+            return [file_path.stem for file_path in islice(file_paths, limit or None)]
             
-            # 遍历年目录
-            for year_dir in sorted(conversations_dir.iterdir(), reverse=True):
-                if not year_dir.is_dir() or not year_dir.name.isdigit():
+        except Exception as e:
+            logger.error(f"列出对话记录异常: {e}")
+            return []
+    
+    def iter_conversation_files(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Iterator[Path]:
+        """
+        按从新到旧的顺序逐个产出对话记录文件路径
+        
+        按年/月目录过滤日期（以月为粒度），配合 load_conversation_file 可按路径直接加载，
+        省去按ID定位文件的开销。对话目录不存在时不产出任何路径。
+        
+        Args:
+            start_date: 开始日期过滤
+            end_date: 结束日期过滤
+            
+        Yields:
+            Path: 对话记录文件路径
+        """
+        conversations_dir = self.storage_paths.get_conversations_dir()
+        if not conversations_dir.is_dir():
+            return
+        
+        # 使用os.scandir遍历：DirEntry缓存了目录项类型，is_dir()无需额外stat调用
+        # 遍历年目录
+        for year_name, year_path in self._scan_numeric_dirs(conversations_dir):
+            year = int(year_name)
+            
+            # 遍历月目录
+            for month_name, month_path in self._scan_numeric_dirs(year_path):
+                month = int(month_name)
+                current_date = date(year, month, 1)
+                
+                # 日期过滤
+                if start_date and current_date < start_date:
+                    continue
+                if end_date and current_date > end_date:
                     continue
                 
-                year = int(year_dir.name)
+                # 遍历JSON文件
+                with os.scandir(month_path) as entries:
+                    file_paths = [
+                        entry.path for entry in entries
+                        if entry.name.startswith("conv_") and entry.name.endswith(".json")
+                    ]
                 
-                # 遍历月目录
-                for month_dir in sorted(year_dir.iterdir(), reverse=True):
-                    if not month_dir.is_dir() or not month_dir.name.isdigit():
-                        continue
-                    
-                    month = int(month_dir.name)
-                    current_date = date(year, month, 1)
-                    
-                    # 日期过滤
-                    if start_date and current_date < start_date:
-                        continue
-                    if end_date and current_date > end_date:
-                        continue
-                    
-                    # 遍历JSON文件
-                    for json_file in sorted(month_dir.glob("*.json"), reverse=True):
-                        if json_file.stem.startswith("conv_"):
-                            conversation_ids.append(json_file.stem)
-                            
-                            # 检查数量限制
-                            if limit and len(conversation_ids) >= limit:
-                                return conversation_ids
-            
-            return conversation_ids
+                file_paths.sort(reverse=True)
+                yield from map(Path, file_paths)
+    
+    @staticmethod
+    def _scan_numeric_dirs(parent: Union[str, Path]) -> List[Tuple[str, str]]:
+        """
+        列出目录下名称为纯数字的子目录（年/月目录），按名称倒序排列
+        
+        Args:
+            parent: 父目录路径
             
-        except Exception as e:
-            logger.error(f"列出对话记录异常: {e}")
-            return []
+        Returns:
+            List[Tuple[str, str]]: (目录名, 目录路径) 列表
+        """
+        with os.scandir(parent) as entries:
+            dirs = [
+                (entry.name, entry.path) for entry in entries
+                if entry.name.isdigit() and entry.is_dir()
+            ]
+        dirs.sort(reverse=True)
+        return dirs
     
     def save_solution(self, solution: Solution) -> bool:
         """
@@ -594,11 +1617,15 @@ class FileManager:
         """
         try:
             file_path = self._get_solution_file_path(solution.id)
-            solution_data = solution.to_dict()
-            
-            success = self._atomic_write_json(file_path, solution_data)
+            success = self._atomic_write_json(file_path, solution)
             
             if success:
+                # 文件中已写入当前引用计数，不再需要索引中的覆盖值
+                ref_counts = self._get_ref_counts()
+                with self._index_lock:
+                    popped = ref_counts.pop(solution.id, None)
+                if popped is not None:
+                    self._mark_index_dirty("_ref_counts", {solution.id: None})
                 logger.info(f"保存解决方案成功: {solution.id}")
             else:
                 logger.error(f"保存解决方案失败: {solution.id}")
@@ -625,9 +1652,17 @@ class FileManager:
             if not file_path.exists():
                 return None
             
-            with self._file_lock(file_path, 'r') as f:
-                data = json.load(f)
-                return Solution.from_dict(data)
+            # 以无缓冲二进制模式一次读入整个文件：FileIO.readall按文件大小分配并读取，
+            # 省去缓冲区分配和UTF-8解码，解析器直接处理bytes
+            with self._file_lock(file_path, 'rb', buffering=0) as f:
+                raw = f.read()
+            
+            try:
+                solution = Solution.model_validate_json(raw)
+            except ValidationError:
+                solution = Solution.from_dict(_load_json(raw))
+            
+            return self._apply_ref_count(solution)
                 
         except Exception as e:
             logger.error(f"加载解决方案异常 {solution_id}: {e}")
@@ -651,34 +1686,30 @@ class FileManager:
             return []
         
         try:
+            # 一次扫描目录，按文件名区分单个解决方案文件和批量提取文件
+            solution_ids = []
+            batch_files = []
+            with os.scandir(solutions_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("sol_") and name.endswith(".json"):
+                        solution_ids.append(name[:-5])
+                    elif fnmatch.fnmatchcase(name, "extracted_*_solutions_*.json"):
+                        batch_files.append(Path(entry.path))
+            
+            # 文件读取在线程池中并行执行；两类文件同时提交，按提交顺序收集结果
+            executor = _get_io_executor()
+            single_results = executor.map(self.load_solution, solution_ids)
+            batch_results = executor.map(self._load_solution_batch_file, batch_files)
+            
             # 加载单个解决方案文件 (sol_*.json)
-            for solution_file in solutions_dir.glob("sol_*.json"):
-                try:
-                    solution = self.load_solution(solution_file.stem)
-                    if solution:
-                        solutions.append(solution)
-                except Exception as e:
-                    logger.warning(f"加载单个解决方案文件失败 {solution_file}: {e}")
-                    continue
+            for solution in single_results:
+                if solution:
+                    solutions.append(solution)
             
             # 加载批量提取的解决方案文件 (extracted_*_solutions_*.json)
-            for batch_file in solutions_dir.glob("extracted_*_solutions_*.json"):
-                try:
-                    with self._file_lock(batch_file, 'r') as f:
-                        data = json.load(f)
-                        
-                    batch_solutions = data.get("solutions", [])
-                    for sol_data in batch_solutions:
-                        try:
-                            solution = Solution.from_dict(sol_data)
-                            solutions.append(solution)
-                        except Exception as e:
-                            logger.warning(f"解析批量解决方案失败 {batch_file}: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.warning(f"加载批量解决方案文件失败 {batch_file}: {e}")
-                    continue
+            for batch_solutions in batch_results:
+                solutions.extend(batch_solutions)
             
             # 去重 - 基于ID，保留引用次数最高的版本
             unique_solutions = {}
@@ -698,12 +1729,44 @@ class FileManager:
             logger.error(f"批量加载解决方案失败: {e}")
             return []
     
+    def _load_solution_batch_file(self, batch_file: Path) -> List[Solution]:
+        """
+        加载批量提取的解决方案文件
+        
+        Args:
+            batch_file: 批量文件路径
+            
+        Returns:
+            List[Solution]: 文件中可解析的解决方案，读取失败时返回空列表
+        """
+        solutions = []
+        try:
+            with self._file_lock(batch_file, 'rb', buffering=0) as f:
+                # 批量文件可能较大：内存映射后由解析器直接读取页缓存，避免完整读入字符串
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = _load_json_buffer(mm)
+            
+            batch_solutions = data.get("solutions", [])
+            for sol_data in batch_solutions:
+                try:
+                    solution = Solution.from_dict(sol_data)
+                    solutions.append(solution)
+                except Exception as e:
+                    logger.warning(f"解析批量解决方案失败 {batch_file}: {e}")
+                    continue
+                    
+        except Exception as e:
+            logger.warning(f"加载批量解决方案文件失败 {batch_file}: {e}")
+        
+        return solutions
+    
     def update_solution_reference_count(self, solution_id: str) -> bool:
         """
         更新解决方案的引用计数
         
-        此方法提供了一种高效的方式来增加解决方案的引用计数，
-        无需完整加载和保存解决方案对象。
+        引用计数记录在 indexes/solution_refcounts.json 中，由后台同步线程批量写出，
+        无需重写解决方案文件。load_solution 加载时叠加该计数，
+        下次保存解决方案时计数随文件一并写入。
         
         Args:
             solution_id: 要更新的解决方案ID
@@ -712,35 +1775,76 @@ class FileManager:
             bool: 更新是否成功
         """
         try:
-            # 加载解决方案
-            solution = self.load_solution(solution_id)
-            if not solution:
+            ref_counts = self._get_ref_counts()
+            entry = ref_counts.get(solution_id)
+            
+            if entry is None:
+                # 首次引用：以解决方案文件中的计数为基数
+                solution = self.load_solution(solution_id)
+                if not solution:
+                    logger.warning(f"无法找到解决方案用于引用计数更新: {solution_id}")
+                    return False
+                base_count = solution.reference_count
+            elif self._get_solution_file_path(solution_id).exists():
+                base_count = entry[0]
+            else:
                 logger.warning(f"无法找到解决方案用于引用计数更新: {solution_id}")
                 return False
             
             # 增加引用计数和更新时间
-            solution.increment_reference()
-            
-            # 保存更新后的解决方案
-            success = self.save_solution(solution)
-            if success:
-                logger.debug(f"解决方案引用计数更新成功: {solution_id} -> {solution.reference_count}")
-            else:
-                logger.error(f"保存解决方案引用计数失败: {solution_id}")
+            with self._index_lock:
+                current = ref_counts.get(solution_id)
+                reference_count = (current[0] if current else base_count) + 1
+                entry = ref_counts[solution_id] = [reference_count, datetime.now().isoformat()]
             
-            return success
+            self._mark_index_dirty("_ref_counts", {solution_id: entry})
+            logger.debug(f"解决方案引用计数更新成功: {solution_id} -> {reference_count}")
+            return True
             
         except Exception as e:
             logger.error(f"更新解决方案引用计数异常 {solution_id}: {e}")
             return False
     
+    @staticmethod
+    def _iter_json(root: Union[str, Path], recursive: bool = False):
+        """
+        遍历目录下的JSON文件，产出 (文件名, 文件大小)
+        
+        基于os.scandir：DirEntry的类型信息来自目录读取，is_file()通常无需额外系统调用。
+        
+        Args:
+            root: 起始目录
+            recursive: 是否递归子目录
+        """
+        with os.scandir(root) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_file():
+                    if entry.name.endswith(".json"):
+                        yield entry.name, entry.stat().st_size
+                elif recursive and entry.is_dir():
+                    subdirs.append(entry.path)
+        
+        for subdir in subdirs:
+            yield from FileManager._iter_json(subdir, recursive=True)
+    
+    def invalidate_statistics(self) -> None:
+        """丢弃存储统计缓存（数据经由其他FileManager实例或外部修改后调用）"""
+        self._stats_cache = None
+    
     def get_storage_statistics(self) -> StorageStats:
         """
         获取存储统计信息
         
+        结果会被缓存，直到本实例写入、删除或导入数据。
+        
         Returns:
             StorageStats: 存储统计信息
         """
+        cached = self._stats_cache
+        if cached is not None:
+            return replace(cached)
+        
         stats = StorageStats(last_updated=datetime.now())
         
         try:
@@ -752,29 +1856,25 @@ class FileManager:
             
             # 统计对话记录
             if conversations_dir.exists():
-                for file_path in conversations_dir.rglob("*.json"):
-                    if file_path.is_file():
-                        stats.total_conversations += 1
-                        total_files += 1
-                        file_size = file_path.stat().st_size
-                        total_size += file_size
+                for _, file_size in self._iter_json(conversations_dir, recursive=True):
+                    stats.total_conversations += 1
+                    total_size += file_size
             
             # 统计解决方案
             if solutions_dir.exists():
-                for file_path in solutions_dir.glob("*.json"):
-                    if file_path.is_file():
-                        stats.total_solutions += 1
-                        total_files += 1
-                        file_size = file_path.stat().st_size
-                        total_size += file_size
+                for _, file_size in self._iter_json(solutions_dir):
+                    stats.total_solutions += 1
+                    total_size += file_size
             
             # 计算统计指标
+            total_files = stats.total_conversations + stats.total_solutions
             stats.total_files = total_files
             stats.total_size_bytes = total_size
             stats.disk_usage_mb = total_size / (1024 * 1024)
             stats.avg_file_size_kb = (total_size / total_files / 1024) if total_files > 0 else 0
             
-            return stats
+            self._stats_cache = stats
+            return replace(stats)
             
         except Exception as e:
             logger.error(f"获取存储统计异常: {e}")
@@ -838,13 +1938,14 @@ class FileManager:
             logger.error(f"清理备份文件异常: {e}")
             return cleaned_count
     
-    def export_data(self, export_path: Path, include_backups: bool = False) -> bool:
+    def export_data(self, export_path: Path, include_backups: bool = False, pretty: bool = False) -> bool:
         """
         导出所有数据到指定路径
         
         Args:
             export_path: 导出目录路径
             include_backups: 是否包含备份文件
+            pretty: 是否将导出的对话、解决方案和索引JSON重新格式化为带缩进的格式（存储中为紧凑格式）
             
         Returns:
             bool: 导出是否成功
@@ -856,26 +1957,30 @@ class FileManager:
             conversations_src = self.storage_paths.get_conversations_dir()
             if conversations_src.exists():
                 conversations_dst = export_path / "conversations"
-                shutil.copytree(conversations_src, conversations_dst, dirs_exist_ok=True)
+                shutil.copytree(conversations_src, conversations_dst, dirs_exist_ok=True, copy_function=_fast_copy)
             
             # 导出解决方案
             solutions_src = self.storage_paths.get_solutions_dir()
             if solutions_src.exists():
                 solutions_dst = export_path / "solutions"
-                shutil.copytree(solutions_src, solutions_dst, dirs_exist_ok=True)
+                shutil.copytree(solutions_src, solutions_dst, dirs_exist_ok=True, copy_function=_fast_copy)
             
             # 导出索引
             indexes_src = self.storage_paths.get_indexes_dir()
             if indexes_src.exists():
                 indexes_dst = export_path / "indexes"
-                shutil.copytree(indexes_src, indexes_dst, dirs_exist_ok=True)
+                shutil.copytree(indexes_src, indexes_dst, dirs_exist_ok=True, copy_function=_fast_copy)
             
             # 可选导出备份
             if include_backups:
                 backups_src = self.storage_paths.get_backups_dir()
                 if backups_src.exists():
                     backups_dst = export_path / "backups"
-                    shutil.copytree(backups_src, backups_dst, dirs_exist_ok=True)
+                    shutil.copytree(backups_src, backups_dst, dirs_exist_ok=True, copy_function=_fast_copy)
+            
+            if pretty:
+                for subdir in ("conversations", "solutions", "indexes"):
+                    self._prettify_json_tree(export_path / subdir)
             
             # 生成导出信息文件
             export_info = {
@@ -896,6 +2001,64 @@ class FileManager:
             logger.error(f"数据导出失败: {e}")
             return False
     
+    def _prettify_json_tree(self, root: Path) -> None:
+        """
+        将目录下所有JSON文件重写为带缩进的格式
+        
+        Args:
+            root: 目录路径
+        """
+        if not root.exists():
+            return
+        
+        for dir_path, _, file_names in os.walk(root):
+            for name in file_names:
+                if not name.endswith(".json"):
+                    continue
+                file_path = os.path.join(dir_path, name)
+                try:
+                    with open(file_path, 'rb') as f:
+                        data = _load_json(f.read())
+                    with open(file_path, 'wb') as f:
+                        f.write(_dump_json_bytes(data, pretty=True))
+                except Exception as e:
+                    logger.warning(f"格式化导出文件失败 {file_path}: {e}")
+    
+    def _merge_imported_ref_counts(self, index_path: Path) -> None:
+        """
+        将导入源的引用计数合并到本地索引
+        
+        同一解决方案在两边都有计数时取较大的计数和较晚的最后引用时间，
+        避免追加导入丢失本地的引用记录。
+        
+        Args:
+            index_path: 导入源中的引用计数索引文件
+        """
+        try:
+            imported = _load_json(index_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取导入的引用计数失败: {e}")
+            return
+        if not isinstance(imported, dict):
+            return
+        
+        ref_counts = self._get_ref_counts()
+        changes = {}
+        with self._index_lock:
+            for solution_id, entry in imported.items():
+                local = ref_counts.get(solution_id)
+                if local is None:
+                    merged = entry
+                else:
+                    merged = [max(local[0], entry[0]), max(local[1], entry[1])]
+                if merged != local:
+                    ref_counts[solution_id] = changes[solution_id] = merged
+        
+        if changes:
+            self._mark_index_dirty("_ref_counts", changes)
+    
     def import_data(self, import_path: Path, merge_mode: str = "append") -> bool:
         """
         从指定路径导入数据
@@ -912,6 +2075,9 @@ class FileManager:
                 logger.error(f"导入路径不存在: {import_path}")
                 return False
             
+            # 先写出尚未同步的索引改动，备份和下面的索引合并都基于磁盘上的最新内容
+            self.flush()
+            
             # 创建完整备份
             backup_success = self.export_data(
                 self.storage_paths.get_backups_dir() / f"pre_import_{int(time.time())}",
@@ -921,29 +2087,59 @@ class FileManager:
             if not backup_success:
                 logger.warning("导入前备份失败，继续导入")
             
-            # 导入对话记录
-            conversations_src = import_path / "conversations"
-            if conversations_src.exists():
-                conversations_dst = self.storage_paths.get_conversations_dir()
-                if merge_mode == "overwrite" and conversations_dst.exists():
-                    shutil.rmtree(conversations_dst)
-                shutil.copytree(conversations_src, conversations_dst, dirs_exist_ok=True)
-            
-            # 导入解决方案
-            solutions_src = import_path / "solutions"
-            if solutions_src.exists():
-                solutions_dst = self.storage_paths.get_solutions_dir()
-                if merge_mode == "overwrite" and solutions_dst.exists():
-                    shutil.rmtree(solutions_dst)
-                shutil.copytree(solutions_src, solutions_dst, dirs_exist_ok=True)
-            
-            # 导入索引
-            indexes_src = import_path / "indexes"
-            if indexes_src.exists():
-                indexes_dst = self.storage_paths.get_indexes_dir()
-                if merge_mode == "overwrite" and indexes_dst.exists():
-                    shutil.rmtree(indexes_dst)
-                shutil.copytree(indexes_src, indexes_dst, dirs_exist_ok=True)
+            # 清理以前覆盖导入时未删完的旧目录，避免其无限累积
+            _purge_trash(self.storage_paths.get_data_dir())
+            
+            # 追加模式跳过此前已从同一来源导入且未变化的文件；
+            # 覆盖模式会删除已导入的文件，所有来源的记录随之失效
+            import_cache = self._get_import_cache()
+            if merge_mode == "overwrite":
+                import_cache.clear()
+            imported = import_cache.setdefault(str(import_path.resolve()), set())
+            
+            # 导入对话记录、解决方案和索引，三个子目录互不相关，并发复制
+            subtrees = [
+                ("conversations", self.storage_paths.get_conversations_dir()),
+                ("solutions", self.storage_paths.get_solutions_dir()),
+                ("indexes", self.storage_paths.get_indexes_dir()),
+            ]
+            
+            # 追加模式不用导入源的索引覆盖本地索引：ID索引导入后重建，引用计数随后合并
+            exclude = frozenset() if merge_mode == "overwrite" else frozenset(self._INDEX_FILES.values())
+            
+            def _copy_one(name: str, dst: Path) -> None:
+                src = import_path / name
+                if not src.exists():
+                    return
+                if merge_mode == "overwrite" and dst.exists():
+                    _fast_rmtree(dst, wait=False)
+                self._fast_copytree(src, dst, imported, name + "/", exclude if name == "indexes" else frozenset())
+            
+            with ThreadPoolExecutor(max_workers=len(subtrees), thread_name_prefix="synapse-import") as executor:
+                futures = [executor.submit(_copy_one, name, dst) for name, dst in subtrees]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+                for future in done:
+                    future.result()
+            
+            self._save_import_cache()
+            
+            # 导入改变了数据文件，丢弃统计缓存和内存中的索引：
+            # ID索引删除后重建；引用计数从索引文件重新加载（覆盖模式下即导入的索引，
+            # 追加模式下再合并导入源的计数）
+            self._stats_cache = None
+            self._known_dirs.clear()
+            with self._index_lock:
+                self._id_index = None
+                self._ref_counts = None
+            with self._sync_cond:
+                self._dirty_indexes.clear()
+            self._get_id_index_path().unlink(missing_ok=True)
+            if merge_mode != "overwrite":
+                self._merge_imported_ref_counts(import_path / "indexes" / self._INDEX_FILES["_ref_counts"])
+            # 目录大小缓存（StorageInitializer.get_storage_status使用）同样失效，下次查询时重新统计
+            (self.storage_paths.get_indexes_dir() / "size_cache.json").unlink(missing_ok=True)
             
             logger.info(f"数据导入成功: {import_path}")
             return True
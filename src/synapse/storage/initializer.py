@@ -6,14 +6,283 @@ including creating directory structures, generating default configuration
 files, and validating storage permissions.
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import logging
 import sys
 import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from synapse.storage.paths import StoragePaths
+from synapse.storage.file_manager import _dump_json_bytes, _fast_rmtree, _load_json, _write_atomic
+
+try:
+    import liburing
+except ImportError:
+    # liburing is optional (Linux only); without it sizes come from a scandir walk
+    liburing = None
+
+logger = logging.getLogger(__name__)
+
+# Number of statx requests submitted to io_uring per batch
+_IO_URING_BATCH = 4096
+
+
+def _atomic_write_json(path: Path, obj) -> None:
+    """
+    Atomically write an object to a JSON file with 2-space indentation.
+    
+    Serialized and written through file_manager's helpers: the data is
+    fsynced to a temporary sibling which then replaces the target, so a
+    crash mid-write never leaves a truncated file behind.
+    """
+    _write_atomic(Path(path), _dump_json_bytes(obj, pretty=True))
+
+
+def _walk_size(path: str) -> int:
+    """
+    Sum the sizes of all regular files below a directory.
+    
+    Built on os.scandir so the file type and stat results cached on each
+    DirEntry are reused instead of issuing separate stat calls.
+    Symlinked directories are not descended into, matching Path.rglob.
+    """
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += _walk_size(entry.path)
+            elif entry.is_file():
+                total += entry.stat().st_size
+    return total
+
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    _FIND_EX_INFO_BASIC = 1
+    _FIND_EX_SEARCH_NAME_MATCH = 0
+    _FIND_FIRST_EX_LARGE_FETCH = 2
+    _FILE_ATTRIBUTE_DIRECTORY = 0x10
+    _FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+    _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.FindFirstFileExW.argtypes = [
+        wintypes.LPCWSTR, ctypes.c_int, ctypes.POINTER(wintypes.WIN32_FIND_DATAW),
+        ctypes.c_int, ctypes.c_void_p, wintypes.DWORD
+    ]
+    _kernel32.FindFirstFileExW.restype = wintypes.HANDLE
+    _kernel32.FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+    _kernel32.FindNextFileW.restype = wintypes.BOOL
+    _kernel32.FindClose.argtypes = [wintypes.HANDLE]
+    _kernel32.FindClose.restype = wintypes.BOOL
+
+    def _find_size(path: str) -> int:
+        """
+        Sum file sizes below a directory with FindFirstFileExW/FindNextFileW.
+        
+        File sizes come back inline with the directory enumeration, so no
+        per-file stat is needed. Reparse points are not descended into.
+        """
+        total = 0
+        data = wintypes.WIN32_FIND_DATAW()
+        handle = _kernel32.FindFirstFileExW(
+            os.path.join(path, "*"), _FIND_EX_INFO_BASIC, ctypes.byref(data),
+            _FIND_EX_SEARCH_NAME_MATCH, None, _FIND_FIRST_EX_LARGE_FETCH
+        )
+        if handle == _INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            while True:
+                name = data.cFileName
+                attributes = data.dwFileAttributes
+                if attributes & _FILE_ATTRIBUTE_DIRECTORY:
+                    if name not in (".", "..") and not attributes & _FILE_ATTRIBUTE_REPARSE_POINT:
+                        total += _find_size(os.path.join(path, name))
+                else:
+                    total += (data.nFileSizeHigh << 32) | data.nFileSizeLow
+                if not _kernel32.FindNextFileW(handle, ctypes.byref(data)):
+                    break
+        finally:
+            _kernel32.FindClose(handle)
+        return total
+
+
+def _io_uring_enabled() -> bool:
+    """
+    Whether directory sizes may be computed through io_uring.
+    
+    Opt-in via SYNAPSE_IO_URING=1, and only on Linux 5.6+ (IORING_OP_STATX)
+    with the liburing binding installed.
+    """
+    if liburing is None or os.environ.get("SYNAPSE_IO_URING") != "1":
+        return False
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        major, minor = (int(part) for part in platform.release().split('.')[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (5, 6)
+
+
+def _uring_size(path: str) -> int:
+    """
+    Sum file sizes below a directory, issuing the stat calls through io_uring.
+    
+    Directories are enumerated with os.scandir (file types come from d_type
+    without a stat), then the regular files are stat'ed with IORING_OP_STATX
+    in batches of _IO_URING_BATCH, one io_uring_enter per batch.
+    """
+    files = []
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+    
+    total = 0
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(_IO_URING_BATCH, ring)
+    try:
+        for start in range(0, len(files), _IO_URING_BATCH):
+            batch = files[start:start + _IO_URING_BATCH]
+            results = [liburing.Statx() for _ in batch]
+            for name, result in zip(batch, results):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(sqe, result, name, 0, liburing.STATX_SIZE)
+            liburing.io_uring_submit(ring)
+            for _ in batch:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                liburing.trap_error(entry.res)
+                liburing.io_uring_cqe_seen(ring, entry)
+            total += sum(result.size for result in results)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return total
+
+
+def _dir_size_fast(path: str) -> int:
+    """
+    Compute the total size of the regular files below a directory.
+    
+    Every strategy sums file sizes only (directory entries are not counted),
+    so the result is the same on every platform and fallback path. On Linux
+    the stat calls are batched through io_uring when enabled (see
+    _io_uring_enabled); on Windows the tree is enumerated with
+    FindFirstFileExW, which returns sizes inline. Falls back to the scandir
+    walk elsewhere or when the fast path fails.
+    """
+    if _io_uring_enabled():
+        try:
+            return _uring_size(path)
+        except OSError as e:
+            # e.g. io_uring disabled by sysctl/seccomp, or a file vanished mid-scan
+            logger.warning(f"io_uring size scan failed for {path}, falling back to scandir: {e}")
+    if os.name == 'nt':
+        try:
+            return _find_size(path)
+        except OSError:
+            pass
+    return _walk_size(path)
+
+
+# Cached per-directory sizes for get_storage_status, kept in the indexes directory
+SIZE_CACHE_FILE = "size_cache.json"
+# Cached sizes older than this (seconds) are refreshed in the background
+_SIZE_CACHE_MAX_AGE = 300
+# Held while a size refresh runs so concurrent status calls don't start another
+_size_refresh_lock = threading.Lock()
+
+# Sentinel written at first start in place of the default index files
+INDEXES_EMPTY_MARKER = ".indexes_empty"
+
+
+def _default_keyword_index(created_at: str) -> Dict[str, any]:
+    """Default contents of keyword_index.json."""
+    return {
+        "version": "1.0",
+        "created_at": created_at,
+        "last_updated": created_at,
+        "total_entries": 0,
+        "keywords": {}
+    }
+
+
+def _default_tag_index(created_at: str) -> Dict[str, any]:
+    """Default contents of tag_index.json."""
+    return {
+        "version": "1.0",
+        "created_at": created_at,
+        "last_updated": created_at,
+        "total_tags": 0,
+        "tags": {}
+    }
+
+
+def _default_metadata(created_at: str) -> Dict[str, any]:
+    """Default contents of metadata.json."""
+    return {
+        "version": "1.0",
+        "created_at": created_at,
+        "last_maintenance": created_at,
+        "statistics": {
+            "total_conversations": 0,
+            "total_solutions": 0,
+            "total_storage_bytes": 0
+        },
+        "health": {
+            "last_health_check": created_at,
+            "status": "healthy"
+        }
+    }
+
+
+# Index file name -> factory building its default payload from a timestamp
+DEFAULT_INDEXES = {
+    "keyword_index.json": _default_keyword_index,
+    "tag_index.json": _default_tag_index,
+    "metadata.json": _default_metadata,
+}
+
+
+def _load_or_default(index_file: Path, default_factory) -> Dict[str, any]:
+    """
+    Load an index file, or build its default payload if it was never written.
+    
+    Missing index files are the normal state after first start (only the
+    INDEXES_EMPTY_MARKER sentinel is created), so the defaults are produced
+    here on read, stamped with the sentinel's creation time. Whoever first
+    modifies an index should write the full file with _atomic_write_json.
+    
+    Args:
+        index_file: Path of the index JSON file
+        default_factory: Callable taking an ISO timestamp and returning the default dict
+        
+    Returns:
+        Dict: The stored or default index contents
+    """
+    try:
+        data = Path(index_file).read_bytes()
+    except FileNotFoundError:
+        try:
+            created = os.stat(Path(index_file).parent / INDEXES_EMPTY_MARKER).st_mtime
+            created_at = datetime.fromtimestamp(created).isoformat()
+        except OSError:
+            created_at = datetime.now().isoformat()
+        return default_factory(created_at)
+    return _load_json(data)
 
 
 class StorageInitializer:
@@ -36,6 +305,15 @@ class StorageInitializer:
         """
         self.storage_paths = storage_paths
         self.initialization_marker = storage_paths.get_config_dir() / ".initialized"
+        
+        # String forms of the storage directories for os/os.path calls in
+        # status and permission checks; Path objects are only built at API edges
+        self._str_paths: Dict[str, str] = {
+            name: str(path) for name, path in storage_paths.get_all_directories().items()
+        }
+        
+        # Cached result of is_initialized(); None until the marker is first checked
+        self._initialized_cache: Optional[bool] = None
     
     def is_initialized(self) -> bool:
         """
@@ -44,7 +322,13 @@ class StorageInitializer:
         Returns:
             bool: True if initialization has been completed previously
         """
-        return self.initialization_marker.exists()
+        if self._initialized_cache is None:
+            try:
+                os.stat(self.initialization_marker)
+                self._initialized_cache = True
+            except OSError:
+                self._initialized_cache = False
+        return self._initialized_cache
     
     def initialize_storage(self, force: bool = False, show_info: bool = True) -> Tuple[bool, List[str]]:
         """
@@ -116,11 +400,37 @@ class StorageInitializer:
         directories = self.storage_paths.get_all_directories()
         success = True
         
+        # The directories share ancestors (data contains conversations,
+        # solutions, ...), so collect every missing directory once, stopping
+        # at the first ancestor that already exists or is already collected.
+        missing = set()
+        for path in directories.values():
+            for candidate in (path, *path.parents):
+                if candidate in missing or os.path.isdir(candidate):
+                    break
+                missing.add(candidate)
+        
+        # Create parents before children, one non-recursive mkdir each
+        failed = {}
+        for path in sorted(missing, key=lambda p: len(p.parts)):
+            if path.parent in failed:
+                failed[path] = failed[path.parent]
+                continue
+            try:
+                os.mkdir(path)
+            except FileExistsError as e:
+                # Created concurrently is fine; an existing file is not
+                if not os.path.isdir(path):
+                    failed[path] = e
+            except OSError as e:
+                failed[path] = e
+        
         for name, path in directories.items():
-            if self.storage_paths.create_directory(path):
+            error = failed.get(path)
+            if error is None:
                 messages.append(f"📁 Created {name} directory: {path}")
             else:
-                messages.append(f"❌ Failed to create {name} directory: {path}")
+                messages.append(f"❌ Failed to create {name} directory: {path} ({error})")
                 success = False
         
         return success
@@ -143,7 +453,8 @@ class StorageInitializer:
                     "max_conversation_size_kb": 500,
                     "max_conversations": 10000,
                     "auto_backup": True,
-                    "backup_interval_days": 7
+                    "backup_interval_days": 7,
+                    "fast_copy": True
                 },
                 "search": {
                     "max_results": 50,
@@ -165,8 +476,7 @@ class StorageInitializer:
                 }
             }
             
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
+            _atomic_write_json(config_file, default_config)
             
             messages.append(f"⚙️  Created default configuration: {config_file}")
         
@@ -210,74 +520,28 @@ class StorageInitializer:
                 }
             }
             
-            with open(log_config_file, 'w', encoding='utf-8') as f:
-                json.dump(log_config, f, indent=2)
+            _atomic_write_json(log_config_file, log_config)
             
             messages.append(f"📝 Created logging configuration: {log_config_file}")
     
     def _create_default_indexes(self, messages: List[str]) -> None:
         """
-        Create default index files if they don't exist.
+        Mark the default index files as pending instead of writing them.
         
         Args:
             messages: List to append status messages to
         """
         indexes_dir = self.storage_paths.get_indexes_dir()
         
-        # Keyword index
-        keyword_index_file = indexes_dir / "keyword_index.json"
-        if not keyword_index_file.exists():
-            default_keyword_index = {
-                "version": "1.0",
-                "created_at": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "total_entries": 0,
-                "keywords": {}
-            }
-            
-            with open(keyword_index_file, 'w', encoding='utf-8') as f:
-                json.dump(default_keyword_index, f, indent=2)
-            
-            messages.append(f"🔍 Created keyword index: {keyword_index_file}")
-        
-        # Tag index
-        tag_index_file = indexes_dir / "tag_index.json"
-        if not tag_index_file.exists():
-            default_tag_index = {
-                "version": "1.0",
-                "created_at": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "total_tags": 0,
-                "tags": {}
-            }
-            
-            with open(tag_index_file, 'w', encoding='utf-8') as f:
-                json.dump(default_tag_index, f, indent=2)
-            
-            messages.append(f"🏷️  Created tag index: {tag_index_file}")
-        
-        # Metadata file
-        metadata_file = indexes_dir / "metadata.json"
-        if not metadata_file.exists():
-            metadata = {
-                "version": "1.0",
-                "created_at": datetime.now().isoformat(),
-                "last_maintenance": datetime.now().isoformat(),
-                "statistics": {
-                    "total_conversations": 0,
-                    "total_solutions": 0,
-                    "total_storage_bytes": 0
-                },
-                "health": {
-                    "last_health_check": datetime.now().isoformat(),
-                    "status": "healthy"
-                }
-            }
-            
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
-            
-            messages.append(f"📊 Created metadata file: {metadata_file}")
+        # The index files are materialized lazily (see _load_or_default);
+        # only a sentinel is written here, and only on a fresh store
+        if any((indexes_dir / name).exists() for name in DEFAULT_INDEXES):
+            return
+        
+        marker = indexes_dir / INDEXES_EMPTY_MARKER
+        if not marker.exists():
+            marker.touch()
+            messages.append(f"🔍 Default indexes deferred until first use: {indexes_dir}")
     
     def _validate_storage_permissions(self, messages: List[str]) -> None:
         """
@@ -286,10 +550,14 @@ class StorageInitializer:
         Args:
             messages: List to append status messages to
         """
-        directories = self.storage_paths.get_all_directories()
+        directories = self._str_paths
         
-        for name, path in directories.items():
-            if self.storage_paths.validate_permissions(path):
+        # Each probe creates and removes a file; run them concurrently and report in order
+        with ThreadPoolExecutor(max_workers=len(directories)) as pool:
+            results = list(pool.map(self.storage_paths.validate_permissions, directories.values()))
+        
+        for (name, path), permitted in zip(directories.items(), results):
+            if permitted:
                 messages.append(f"✅ {name} directory permissions OK")
             else:
                 messages.append(f"⚠️  Warning: Limited permissions for {name} directory: {path}")
@@ -300,12 +568,12 @@ class StorageInitializer:
             "initialized_at": datetime.now().isoformat(),
             "version": "1.0.0",
             "platform": sys.platform,
-            "python_version": sys.version,
+            "python_version": list(sys.version_info[:3]),  # [major, minor, micro]
             "storage_paths": self.storage_paths.get_storage_info()
         }
         
-        with open(self.initialization_marker, 'w', encoding='utf-8') as f:
-            json.dump(marker_data, f, indent=2)
+        _atomic_write_json(self.initialization_marker, marker_data)
+        self._initialized_cache = True
     
     def _display_storage_info(self, messages: List[str]) -> None:
         """
@@ -345,7 +613,7 @@ class StorageInitializer:
         Returns:
             Dict with storage status details
         """
-        directories = self.storage_paths.get_all_directories()
+        directories = self._str_paths
         status = {
             "initialized": self.is_initialized(),
             "storage_paths": self.storage_paths.get_storage_info(),
@@ -354,22 +622,16 @@ class StorageInitializer:
             "total_size_bytes": 0
         }
         
-        for name, path in directories.items():
-            dir_info = {
-                "exists": path.exists(),
-                "writable": self.storage_paths.validate_permissions(path) if path.exists() else False,
-                "size_bytes": 0
-            }
-            
-            # Calculate directory size if it exists
-            if path.exists():
-                try:
-                    dir_info["size_bytes"] = sum(
-                        f.stat().st_size for f in path.rglob('*') if f.is_file()
-                    )
-                    status["total_size_bytes"] += dir_info["size_bytes"]
-                except (OSError, PermissionError):
-                    dir_info["size_bytes"] = -1  # Error calculating size
+        # Directories are probed concurrently; map() keeps the results in directory order
+        with ThreadPoolExecutor(max_workers=len(directories)) as pool:
+            results = list(pool.map(self._probe_directory, directories.values()))
+        
+        sizes = self._get_directory_sizes()
+        for name, dir_info in zip(directories, results):
+            if dir_info["exists"]:
+                dir_info["size_bytes"] = sizes.get(name, 0)
+            if dir_info["size_bytes"] > 0:
+                status["total_size_bytes"] += dir_info["size_bytes"]
             
             if not dir_info["writable"]:
                 status["permissions_ok"] = False
@@ -378,6 +640,77 @@ class StorageInitializer:
         
         return status
     
+    def _probe_directory(self, path: str) -> Dict[str, any]:
+        """
+        Collect existence and writability information for one directory.
+        
+        Args:
+            path: Directory to probe, as a plain string
+            
+        Returns:
+            Dict with "exists", "writable" and "size_bytes" (filled in by the caller)
+        """
+        exists = os.path.exists(path)
+        return {
+            "exists": exists,
+            "writable": self.storage_paths.validate_permissions(path) if exists else False,
+            "size_bytes": 0
+        }
+    
+    def _get_directory_sizes(self) -> Dict[str, int]:
+        """
+        Return per-directory sizes from the size cache.
+        
+        The cache is computed synchronously only when it is missing or
+        unreadable; when it is older than _SIZE_CACHE_MAX_AGE the cached
+        values are returned and a refresh is started in a background thread.
+        
+        Returns:
+            Dict[str, int]: Directory name to size in bytes (-1 if sizing failed)
+        """
+        cache_file = self.storage_paths.get_indexes_dir() / SIZE_CACHE_FILE
+        try:
+            age = time.time() - os.stat(cache_file).st_mtime
+            sizes = _load_json(cache_file.read_bytes())
+            if not isinstance(sizes, dict):
+                raise ValueError("invalid size cache")
+        except (OSError, ValueError):
+            return self._refresh_directory_sizes()
+        
+        if age > _SIZE_CACHE_MAX_AGE and not _size_refresh_lock.locked():
+            threading.Thread(
+                target=self._refresh_directory_sizes, name="synapse-size-refresh", daemon=True
+            ).start()
+        return sizes
+    
+    def _refresh_directory_sizes(self) -> Dict[str, int]:
+        """
+        Measure every existing storage directory and rewrite the size cache.
+        
+        Returns:
+            Dict[str, int]: Directory name to size in bytes (-1 if sizing failed)
+        """
+        def measure(path: str) -> int:
+            if not os.path.exists(path):
+                return 0
+            try:
+                return _dir_size_fast(path)
+            except (OSError, PermissionError):
+                return -1  # Error calculating size
+        
+        with _size_refresh_lock:
+            directories = self._str_paths
+            with ThreadPoolExecutor(max_workers=len(directories)) as pool:
+                sizes = dict(zip(directories, pool.map(measure, directories.values())))
+            
+            indexes_dir = self._str_paths["indexes"]
+            if os.path.isdir(indexes_dir):
+                try:
+                    _atomic_write_json(Path(indexes_dir) / SIZE_CACHE_FILE, sizes)
+                except OSError:
+                    pass  # The sizes are still returned; the next call recomputes
+        return sizes
+    
     def cleanup_storage(self, confirm: bool = False) -> Tuple[bool, List[str]]:
         """
         Clean up storage (for development/testing purposes).
@@ -396,30 +729,34 @@ class StorageInitializer:
             return False, messages
         
         try:
-            import shutil
+            # Deleted synchronously: the data, config and cache dirs live in shared
+            # XDG parents that _purge_trash never scans, so nothing may be left behind
             
             # Remove data directory
             data_dir = self.storage_paths.get_data_dir()
             if data_dir.exists():
-                shutil.rmtree(data_dir)
+                _fast_rmtree(data_dir)
                 messages.append(f"🗑️  Removed data directory: {data_dir}")
             
             # Remove config directory
             config_dir = self.storage_paths.get_config_dir()
             if config_dir.exists():
-                shutil.rmtree(config_dir)
+                _fast_rmtree(config_dir)
                 messages.append(f"🗑️  Removed config directory: {config_dir}")
             
             # Remove cache directory
             cache_dir = self.storage_paths.get_cache_dir()
             if cache_dir.exists():
-                shutil.rmtree(cache_dir)
+                _fast_rmtree(cache_dir)
                 messages.append(f"🗑️  Removed cache directory: {cache_dir}")
             
+            self._initialized_cache = False
             messages.append("✅ Storage cleanup completed")
             return True, messages
             
         except Exception as e:
+            # Partial cleanup may or may not have removed the marker
+            self._initialized_cache = None
             messages.append(f"❌ Failed to cleanup storage: {e}")
             return False, messages
 
@@ -10,11 +10,32 @@ Storage Location Standards:
 - Windows: %APPDATA%\\synapse\\synapse-mcp\\ (data and config)
 """
 
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
 import platformdirs
 
 
+@lru_cache(maxsize=None)
+def _platform_dirs(app_name: str, app_author: str) -> Tuple[Path, Path, Path]:
+    """
+    Resolve the platformdirs data, config and cache directories once per app.
+    
+    platformdirs consults environment variables (and the registry on Windows)
+    on every call, so repeated StoragePaths construction reuses this result.
+    
+    Returns:
+        Tuple[Path, Path, Path]: (data_dir, config_dir, cache_dir)
+    """
+    return (
+        Path(platformdirs.user_data_dir(appname=app_name, appauthor=app_author)),
+        Path(platformdirs.user_config_dir(appname=app_name, appauthor=app_author)),
+        Path(platformdirs.user_cache_dir(appname=app_name, appauthor=app_author)),
+    )
+
+
 class StoragePaths:
     """
     Cross-platform storage path management for Synapse MCP.
@@ -38,19 +59,21 @@ class StoragePaths:
         self.app_name = app_name
         self.app_author = app_author
         
-        # Initialize platformdirs paths
-        self._data_dir = platformdirs.user_data_dir(
-            appname=self.app_name, 
-            appauthor=self.app_author
-        )
-        self._config_dir = platformdirs.user_config_dir(
-            appname=self.app_name, 
-            appauthor=self.app_author
-        )
-        self._cache_dir = platformdirs.user_cache_dir(
-            appname=self.app_name, 
-            appauthor=self.app_author
+        # Initialize platformdirs paths (resolved once per process)
+        self._data_dir, self._config_dir, self._cache_dir = _platform_dirs(
+            self.app_name, self.app_author
         )
+        
+        # Derived directories are fixed for the lifetime of the instance
+        self._conversations_dir = self._data_dir / "conversations"
+        self._solutions_dir = self._data_dir / "solutions"
+        self._indexes_dir = self._data_dir / "indexes"
+        self._logs_dir = self._data_dir / "logs"
+        self._backups_dir = self._data_dir / "backups"
+        
+        # Built on first use by get_all_directories / get_storage_info
+        self._all_dirs: Optional[Dict[str, Path]] = None
+        self._storage_info: Optional[Dict[str, str]] = None
     
     def get_data_dir(self) -> Path:
         """
@@ -67,7 +90,7 @@ class StoragePaths:
             - Linux: /home/username/.local/share/synapse-mcp/
             - Windows: C:\\Users\\username\\AppData\\Roaming\\synapse\\synapse-mcp\\
         """
-        return Path(self._data_dir)
+        return self._data_dir
     
     def get_config_dir(self) -> Path:
         """
@@ -84,7 +107,7 @@ class StoragePaths:
             - Linux: /home/username/.config/synapse-mcp/
             - Windows: C:\\Users\\username\\AppData\\Roaming\\synapse\\synapse-mcp\\ (same as data)
         """
-        return Path(self._config_dir)
+        return self._config_dir
     
     def get_cache_dir(self) -> Path:
         """
@@ -101,7 +124,7 @@ class StoragePaths:
             - Linux: /home/username/.cache/synapse-mcp/
             - Windows: C:\\Users\\username\\AppData\\Local\\synapse\\synapse-mcp\\Cache\\
         """
-        return Path(self._cache_dir)
+        return self._cache_dir
     
     def get_conversations_dir(self) -> Path:
         """
@@ -122,7 +145,7 @@ class StoragePaths:
             │   └── 02/
             └── 2023/
         """
-        return self.get_data_dir() / "conversations"
+        return self._conversations_dir
     
     def get_solutions_dir(self) -> Path:
         """
@@ -134,7 +157,7 @@ class StoragePaths:
         Returns:
             Path: Solutions storage directory
         """
-        return self.get_data_dir() / "solutions"
+        return self._solutions_dir
     
     def get_indexes_dir(self) -> Path:
         """
@@ -152,7 +175,7 @@ class StoragePaths:
             ├── tag_index.json
             └── metadata.json
         """
-        return self.get_data_dir() / "indexes"
+        return self._indexes_dir
     
     def get_logs_dir(self) -> Path:
         """
@@ -161,7 +184,7 @@ class StoragePaths:
         Returns:
             Path: Logs directory path
         """
-        return self.get_data_dir() / "logs"
+        return self._logs_dir
     
     def get_backups_dir(self) -> Path:
         """
@@ -170,7 +193,7 @@ class StoragePaths:
         Returns:
             Path: Backups directory path
         """
-        return self.get_data_dir() / "backups"
+        return self._backups_dir
     
     def get_all_directories(self) -> Dict[str, Path]:
         """
@@ -179,19 +202,24 @@ class StoragePaths:
         This method returns all available directory paths in a structured
         format, useful for initialization and display purposes.
         
+        The dictionary is built once and shared between callers, so it
+        must be treated as read-only.
+        
         Returns:
             Dict[str, Path]: Dictionary mapping directory names to paths
         """
-        return {
-            "data": self.get_data_dir(),
-            "config": self.get_config_dir(),
-            "cache": self.get_cache_dir(),
-            "conversations": self.get_conversations_dir(),
-            "solutions": self.get_solutions_dir(),
-            "indexes": self.get_indexes_dir(),
-            "logs": self.get_logs_dir(),
-            "backups": self.get_backups_dir()
-        }
+        if self._all_dirs is None:
+            self._all_dirs = {
+                "data": self.get_data_dir(),
+                "config": self.get_config_dir(),
+                "cache": self.get_cache_dir(),
+                "conversations": self.get_conversations_dir(),
+                "solutions": self.get_solutions_dir(),
+                "indexes": self.get_indexes_dir(),
+                "logs": self.get_logs_dir(),
+                "backups": self.get_backups_dir()
+            }
+        return self._all_dirs
     
     def get_storage_info(self) -> Dict[str, str]:
         """
@@ -200,13 +228,18 @@ class StoragePaths:
         This method provides formatted string representations of storage
         paths, useful for display to users and logging.
         
+        Like get_all_directories, the result is cached and must not be
+        modified by callers.
+        
         Returns:
             Dict[str, str]: Dictionary with formatted path information
         """
-        dirs = self.get_all_directories()
-        return {
-            name: str(path) for name, path in dirs.items()
-        }
+        if self._storage_info is None:
+            dirs = self.get_all_directories()
+            self._storage_info = {
+                name: str(path) for name, path in dirs.items()
+            }
+        return self._storage_info
     
     def create_directory(self, path: Path, exist_ok: bool = True) -> bool:
         """
@@ -220,32 +253,52 @@ class StoragePaths:
             bool: True if directory was created or already exists, False on error
         """
         try:
-            path.mkdir(parents=True, exist_ok=exist_ok)
+            os.makedirs(path, exist_ok=exist_ok)
             return True
         except (OSError, PermissionError) as e:
             # Log error but don't raise - let caller handle gracefully
             print(f"Warning: Failed to create directory {path}: {e}")
             return False
     
-    def validate_permissions(self, path: Path) -> bool:
+    def validate_permissions(self, path: Union[str, Path]) -> bool:
         """
         Check if we have read/write permissions for a directory.
         
         Args:
-            path: Directory path to check
+            path: Directory path to check (str or Path)
             
         Returns:
             bool: True if we have read/write permissions
         """
         try:
             # Try to create directory if it doesn't exist
-            if not path.exists():
-                path.mkdir(parents=True, exist_ok=True)
+            if not os.path.exists(path):
+                os.makedirs(path, exist_ok=True)
+            
+            # Linux: an unnamed O_TMPFILE inode proves write access without
+            # adding or removing a directory entry, and vanishes on close
+            o_tmpfile = getattr(os, "O_TMPFILE", None)
+            if o_tmpfile is not None:
+                try:
+                    fd = os.open(path, o_tmpfile | os.O_WRONLY, 0o600)
+                except OSError:
+                    pass  # Filesystem without O_TMPFILE support; use a named file
+                else:
+                    os.close(fd)
+                    return True
+            
+            # Windows: TemporaryFile is opened delete-on-close
+            if os.name == 'nt':
+                if not os.access(path, os.W_OK):
+                    return False
+                with tempfile.TemporaryFile(dir=path):
+                    pass
+                return True
             
             # Test write permission by creating and removing a test file
-            test_file = path / ".permission_test"
-            test_file.touch()
-            test_file.unlink()
+            test_file = os.path.join(path, ".permission_test")
+            os.close(os.open(test_file, os.O_WRONLY | os.O_CREAT, 0o666))
+            os.unlink(test_file)
             
             return True
         except (OSError, PermissionError):
@@ -14,19 +14,91 @@ Extract Solutions MCP工具实现模块
 - 性能优化：批量处理和智能缓存，提供高效的提取性能
 """
 
+import asyncio
+import fnmatch
+import hashlib
 import logging
-import json
+import os
+import re
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it legacy history files are parsed in full
+    ijson = None
 
 from synapse.models.conversation import ConversationRecord, Solution
-from synapse.storage.file_manager import FileManager
+from synapse.storage.file_manager import FileManager, _dump_json_bytes, _get_io_executor, _load_json
 from synapse.storage.paths import StoragePaths
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 解决方案类型（保存时按此顺序分组写文件）
+_SOLUTION_TYPES = ("code", "approach", "pattern")
+
+# 支持的提取类型
+_EXTRACT_TYPES = frozenset(_SOLUTION_TYPES + ("all",))
+
+# 提取文件的元数据旁路文件后缀（不以.json结尾，避免被当作解决方案文件加载）
+_META_SUFFIX = ".meta"
+
+# 提取全部对话时同时在I/O线程池中加载的对话数上限，限制内存占用，也避免挤占其他工具的加载任务
+_LOAD_WINDOW = 64
+
+def _write_and_sync(file_path: Path, payload: bytes) -> None:
+    """一次写入整个文件并在关闭前fsync一次"""
+    with open(file_path, 'wb', buffering=1 << 20) as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# 计算内容指纹时每次转小写并编码的字符数，避免为大段代码生成完整的小写副本
+_KEY_CHUNK_CHARS = 64 * 1024
+
+# 代码近似重复检测：128位SimHash，汉明距离不超过该值视为疑似重复（只标记，不合并）
+_SIMHASH_BITS = 128
+_SIMHASH_MAX_DISTANCE = 3
+# SimHash切分的段数；距离不超过3时至少有一段完全相同，只需比较同段候选
+_SIMHASH_BANDS = _SIMHASH_MAX_DISTANCE + 1
+_SIMHASH_BAND_BITS = _SIMHASH_BITS // _SIMHASH_BANDS
+_SIMHASH_SHINGLE = 3
+# 运算符和标点各自作为词元，a+b 与 a-b 的指纹不同
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+
+def _simhash(content: str) -> int:
+    """
+    计算内容的128位SimHash
+    
+    将小写后的词元（标识符、数字，以及逐个的运算符和标点）按3个一组切分（shingle），每组取blake2b-128摘要，
+    按位多数表决得到指纹；内容相近时指纹的汉明距离也小。
+    
+    Returns:
+        int: 128位指纹，内容没有词元时返回0
+    """
+    tokens = _TOKEN_PATTERN.findall(content.lower())
+    if not tokens:
+        return 0
+    shingles = {
+        " ".join(tokens[i:i + _SIMHASH_SHINGLE])
+        for i in range(max(len(tokens) - _SIMHASH_SHINGLE + 1, 1))
+    }
+    
+    # 每个摘要展开为定长二进制串，按列统计1的个数，逐位循环留在C层完成
+    bit_rows = [
+        format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=16).digest(), 'big'),
+               '0128b')
+        for shingle in shingles
+    ]
+    half = len(bit_rows) / 2
+    return int("".join("1" if column.count("1") > half else "0" for column in zip(*bit_rows)), 2)
+
 
 class SolutionExtractor:
     """
@@ -35,118 +107,204 @@ class SolutionExtractor:
     从对话记录中提取解决方案，提供智能的解决方案识别、
     质量评估和去重功能。
     """
+    __slots__ = (
+        "extracted_solutions", "quality_threshold",
+        "_type_counts", "_language_counts", "_total_reusability", "_quality_levels",
+        "_simhash_bands", "_near_duplicates"
+    )
     
     def __init__(self):
         """初始化解决方案提取器"""
         self.extracted_solutions: Dict[str, Solution] = {}
         self.quality_threshold = 0.3  # 最低质量阈值
         
+        # 统计计数器，随解决方案的加入/替换增量维护
+        self._type_counts = {"code": 0, "approach": 0, "pattern": 0}
+        self._language_counts: Dict[str, int] = {}
+        self._total_reusability = 0.0
+        self._quality_levels = {"high": 0, "medium": 0, "low": 0}
+        
+        # 代码解决方案的近似重复索引：(段序号, 段值) -> [(指纹, 语言, 解决方案键)]
+        self._simhash_bands: Dict[Tuple[int, int], List[Tuple[int, Optional[str], str]]] = {}
+        # 疑似近似重复的代码解决方案：解决方案键 -> 与之相近的已提取解决方案键（两者均保留）
+        self._near_duplicates: Dict[str, str] = {}
+    
+    def _update_statistics(self, solution: Solution, delta: int) -> None:
+        """
+        将解决方案计入（delta=1）或移出（delta=-1）统计计数
+        
+        Args:
+            solution: 解决方案对象
+            delta: 计数变化量
+        """
+        self._type_counts[solution.type] += delta
+        
+        lang = solution.language or "none"
+        count = self._language_counts.get(lang, 0) + delta
+        if count:
+            self._language_counts[lang] = count
+        else:
+            self._language_counts.pop(lang, None)
+        
+        self._total_reusability += delta * solution.reusability_score
+        if solution.reusability_score >= 0.8:
+            self._quality_levels["high"] += delta
+        elif solution.reusability_score >= 0.6:
+            self._quality_levels["medium"] += delta
+        else:
+            self._quality_levels["low"] += delta
+        
     def extract_from_conversation(
         self, 
         conversation: ConversationRecord,
         extract_type: str = "all",
         min_reusability_score: float = 0.3
-    ) -> List[Solution]:
+    ) -> Iterator[Solution]:
         """
         从单个对话记录中提取解决方案
         
+        逐个产出新加入的解决方案；与已提取解决方案重复且质量更高的，只替换
+        extracted_solutions 中的条目而不再产出，完整的去重结果以 extracted_solutions 为准。
+        与已提取代码解决方案近似（而非完全相同）的仍会加入，并记录为疑似重复供确认。
+        
         Args:
             conversation: 对话记录对象
             extract_type: 提取类型 ("code", "approach", "pattern", "all")
             min_reusability_score: 最小可重用性分数阈值
             
-        Returns:
-            List[Solution]: 提取的解决方案列表
+        Yields:
+            Solution: 新提取的解决方案
         """
-        if not conversation.solutions:
-            return []
-        
-        extracted = []
+        # 类型过滤在循环外决定一次，与质量过滤合并为一个生成器表达式，循环体只处理去重
+        if extract_type == "all":
+            candidates = (
+                solution for solution in conversation.solutions
+                if solution.reusability_score >= min_reusability_score
+            )
+        else:
+            candidates = (
+                solution for solution in conversation.solutions
+                if solution.type == extract_type and solution.reusability_score >= min_reusability_score
+            )
         
-        for solution in conversation.solutions:
-            # 应用类型过滤
-            if extract_type != "all" and solution.type != extract_type:
-                continue
-            
-            # 应用质量过滤
-            if solution.reusability_score < min_reusability_score:
-                continue
-            
+        for solution in candidates:
             # 检查去重
             solution_key = self._generate_solution_key(solution)
             if solution_key in self.extracted_solutions:
                 # 如果已存在相同解决方案，选择质量更高的
                 existing = self.extracted_solutions[solution_key]
                 if solution.reusability_score > existing.reusability_score:
+                    self._update_statistics(existing, -1)
+                    self._update_statistics(solution, 1)
                     self.extracted_solutions[solution_key] = solution
-                    # 更新列表中的解决方案
-                    for i, ext_sol in enumerate(extracted):
-                        if self._generate_solution_key(ext_sol) == solution_key:
-                            extracted[i] = solution
-                            break
                 continue
             
+            # 近似重复只标记，不丢弃
+            similar_key = self._find_near_duplicate(solution, solution_key)
+            if similar_key is not None:
+                self._near_duplicates[solution_key] = similar_key
+                logger.info(
+                    f"解决方案 {solution.id} 与 {self.extracted_solutions[similar_key].id} 疑似近似重复，已保留"
+                )
+            
             # 添加新解决方案
             self.extracted_solutions[solution_key] = solution
-            extracted.append(solution)
+            self._update_statistics(solution, 1)
+            yield solution
+    
+    def _find_near_duplicate(self, solution: Solution, solution_key: str) -> Optional[str]:
+        """
+        查找与代码解决方案近似的已提取解决方案
+        
+        在SimHash段索引中查找同语言、汉明距离不超过 _SIMHASH_MAX_DISTANCE 的已提取解决方案，
+        并登记本解决方案的指纹。非代码类型或内容没有词元时不做检测。
+        
+        Args:
+            solution: 解决方案对象
+            solution_key: _generate_solution_key 生成的精确键
+            
+        Returns:
+            Optional[str]: 近似解决方案的键，没有时返回None
+        """
+        if solution.type != "code":
+            return None
         
-        return extracted
+        fingerprint = _simhash(solution.content)
+        if not fingerprint:
+            return None
+        
+        mask = (1 << _SIMHASH_BAND_BITS) - 1
+        bands = [
+            (band, (fingerprint >> (band * _SIMHASH_BAND_BITS)) & mask)
+            for band in range(_SIMHASH_BANDS)
+        ]
+        similar_key = next(
+            (
+                other_key
+                for band in bands
+                for other, language, other_key in self._simhash_bands.get(band, ())
+                if language == solution.language
+                and (fingerprint ^ other).bit_count() <= _SIMHASH_MAX_DISTANCE
+            ),
+            None
+        )
+        
+        entry = (fingerprint, solution.language, solution_key)
+        for band in bands:
+            self._simhash_bands.setdefault(band, []).append(entry)
+        return similar_key
     
     def _generate_solution_key(self, solution: Solution) -> str:
         """
         生成解决方案的唯一键用于去重
         
+        基于类型、语言和忽略大小写的内容计算128位blake2b摘要，
+        与内置hash()不同，结果在不同进程间保持稳定。
+        
         Args:
             solution: 解决方案对象
             
         Returns:
-            str: 解决方案的唯一标识键
+            str: 解决方案的唯一标识键（32位十六进制字符串）
         """
-        # 基于内容和类型生成键
-        content_hash = hash(solution.content.strip().lower())
-        type_lang = f"{solution.type}_{solution.language or 'none'}"
-        return f"{type_lang}_{content_hash}"
+        h = hashlib.blake2b(digest_size=16)
+        h.update(solution.type.encode('utf-8'))
+        h.update(b'\0')
+        h.update((solution.language or 'none').encode('utf-8'))
+        h.update(b'\0')
+        
+        # 分块转小写并编码，大段内容不生成完整的小写副本
+        content = solution.content.strip()
+        for start in range(0, len(content), _KEY_CHUNK_CHARS):
+            h.update(content[start:start + _KEY_CHUNK_CHARS].lower().encode('utf-8'))
+        return h.hexdigest()
     
     def get_extraction_statistics(self) -> Dict[str, Any]:
         """
         获取提取统计信息
         
+        直接由增量维护的计数器生成，不遍历已提取的解决方案。
+        
         Returns:
             Dict[str, Any]: 详细的提取统计信息
         """
-        solutions = list(self.extracted_solutions.values())
-        
-        # 按类型统计
-        type_counts = {"code": 0, "approach": 0, "pattern": 0}
-        language_counts = {}
-        
-        total_reusability = 0.0
-        quality_levels = {"high": 0, "medium": 0, "low": 0}
-        
-        for solution in solutions:
-            # 类型统计
-            type_counts[solution.type] += 1
-            
-            # 语言统计
-            lang = solution.language or "none"
-            language_counts[lang] = language_counts.get(lang, 0) + 1
-            
-            # 质量统计
-            total_reusability += solution.reusability_score
-            if solution.reusability_score >= 0.8:
-                quality_levels["high"] += 1
-            elif solution.reusability_score >= 0.6:
-                quality_levels["medium"] += 1
-            else:
-                quality_levels["low"] += 1
+        total = len(self.extracted_solutions)
+        language_counts = dict(self._language_counts)
         
         return {
-            "total_solutions": len(solutions),
-            "by_type": type_counts,
+            "total_solutions": total,
+            "by_type": dict(self._type_counts),
             "by_language": language_counts,
-            "average_reusability": round(total_reusability / max(len(solutions), 1), 3),
-            "quality_distribution": quality_levels,
-            "unique_languages": len([lang for lang in language_counts.keys() if lang != "none"])
+            "average_reusability": round(self._total_reusability / max(total, 1), 3),
+            "quality_distribution": dict(self._quality_levels),
+            "unique_languages": len(language_counts) - ("none" in language_counts),
+            "near_duplicates": [
+                {
+                    "solution_id": self.extracted_solutions[key].id,
+                    "similar_to": self.extracted_solutions[similar_key].id
+                }
+                for key, similar_key in self._near_duplicates.items()
+            ]
         }
 
 
@@ -159,6 +317,7 @@ class ExtractSolutionsTool:
     - 解决方案去重和质量评估
     - 独立存储和索引管理
     """
+    __slots__ = ("storage_paths", "file_manager", "solutions_dir")
     
     def __init__(self, storage_paths: StoragePaths):
         """
@@ -169,7 +328,6 @@ class ExtractSolutionsTool:
         """
         self.storage_paths = storage_paths
         self.file_manager = FileManager(storage_paths)
-        self.extractor = SolutionExtractor()
         
         # 确保solutions目录存在
         self.solutions_dir = storage_paths.get_solutions_dir()
@@ -201,86 +359,125 @@ class ExtractSolutionsTool:
             Dict[str, Any]: 提取结果和统计信息
         """
         try:
-            if ctx:
-                await ctx.info(f"开始提取解决方案 - 对话ID: {conversation_id or 'ALL'}")
-            
             # 参数验证
-            if extract_type not in ["code", "approach", "pattern", "all"]:
+            if extract_type not in _EXTRACT_TYPES:
                 raise ValueError("extract_type必须是 'code', 'approach', 'pattern' 或 'all'")
             
-            if not isinstance(min_reusability_score, (int, float)) or min_reusability_score < 0 or min_reusability_score > 1:
+            try:
+                min_reusability_score = float(min_reusability_score)
+            except (TypeError, ValueError):
+                raise ValueError("min_reusability_score必须在0.0-1.0之间") from None
+            if not 0 <= min_reusability_score <= 1:
                 raise ValueError("min_reusability_score必须在0.0-1.0之间")
             
-            # 重置提取器
-            self.extractor = SolutionExtractor()
+            # 进度信息在结束时一次性发送，减少通知往返
+            progress = [f"开始提取解决方案 - 对话ID: {conversation_id or 'ALL'}"]
             
-            # 确定要处理的对话
-            conversations_to_process = []
+            # 每次调用使用独立的提取器：FastMCP会并发执行工具调用，共享实例的去重表会被相互清空
+            extractor = SolutionExtractor()
+            
+            # 确定要处理的对话：pending中按原始顺序排列加载中（或已加载）的对话future，
+            # remaining为尚未提交加载的对话文件
+            loop = asyncio.get_running_loop()
+            pending = deque()
+            remaining = iter(())
             
             if conversation_id:
                 # 处理指定对话
-                if ctx:
-                    await ctx.info(f"加载指定对话: {conversation_id}")
+                progress.append(f"加载指定对话: {conversation_id}")
                 
-                conversation = self.file_manager.load_conversation(conversation_id)
+                conversation = await asyncio.to_thread(
+                    self.file_manager.load_conversation, conversation_id
+                )
                 if not conversation:
                     raise ValueError(f"找不到指定的对话记录: {conversation_id}")
                 
-                conversations_to_process = [conversation]
+                loaded = loop.create_future()
+                loaded.set_result(conversation)
+                pending.append(loaded)
+                total = 1
                 
             else:
                 # 处理所有对话
-                if ctx:
-                    await ctx.info("加载所有对话记录...")
+                progress.append("加载所有对话记录...")
                 
-                conversation_ids = self.file_manager.list_conversations()
+                conversation_files = await asyncio.to_thread(list, self.file_manager.iter_conversation_files())
                 
-                if ctx:
-                    await ctx.info(f"找到 {len(conversation_ids)} 个对话记录")
-                
-                for i, conv_id in enumerate(conversation_ids):
-                    if ctx and i % 50 == 0:  # 每50个对话报告一次进度
-                        progress = i / len(conversation_ids)
-                        await ctx.report_progress(progress, f"加载对话 {i+1}/{len(conversation_ids)}")
-                    
-                    conv = self.file_manager.load_conversation(conv_id)
-                    if conv:
-                        conversations_to_process.append(conv)
+                progress.append(f"找到 {len(conversation_files)} 个对话记录")
+                remaining = iter(conversation_files)
+                total = len(conversation_files)
             
-            if ctx:
-                await ctx.info(f"开始从 {len(conversations_to_process)} 个对话中提取解决方案...")
+            # 文件读取和JSON解析提交到共享的I/O线程池，既不阻塞事件循环，
+            # 多个对话的磁盘读取和解析也能相互重叠；
+            # 遍历时已得到文件路径，直接按路径加载，省去按ID逐个定位文件的stat调用
+            executor = _get_io_executor()
+            load_conversation_file = self.file_manager.load_conversation_file
             
-            # 执行解决方案提取
-            all_solutions = []
+            def submit_next() -> None:
+                file_path = next(remaining, None)
+                if file_path is not None:
+                    pending.append(loop.run_in_executor(executor, load_conversation_file, file_path))
+            
+            for _ in range(_LOAD_WINDOW):
+                submit_next()
+            
+            progress.append(f"开始从 {total} 个对话中提取解决方案...")
+            
+            # 加载与提取流水线执行：按原始顺序等待每个对话并立即提取，每取出一个就补交一个加载任务，
+            # 进行中的加载不超过 _LOAD_WINDOW 个；按顺序处理保证去重结果与顺序加载一致
+            conversations_processed = 0
             conversations_with_solutions = 0
+            extract_from_conversation = extractor.extract_from_conversation
             
-            for i, conversation in enumerate(conversations_to_process):
-                if ctx and len(conversations_to_process) > 10 and i % 10 == 0:
-                    progress = i / len(conversations_to_process)
-                    await ctx.report_progress(progress, f"提取进度 {i+1}/{len(conversations_to_process)}")
-                
-                extracted = self.extractor.extract_from_conversation(
-                    conversation, extract_type, min_reusability_score
-                )
-                
-                if extracted:
-                    conversations_with_solutions += 1
-                    all_solutions.extend(extracted)
+            try:
+                for i in range(total):
+                    if ctx and total > 10 and i % 10 == 0:
+                        await ctx.report_progress(i / total, f"提取进度 {i+1}/{total}")
+                    
+                    conversation = await pending[0]
+                    pending.popleft()
+                    submit_next()
+                    if not conversation:
+                        continue
+                    conversations_processed += 1
                     
-                    logger.debug(f"从对话 {conversation.id} 提取了 {len(extracted)} 个解决方案")
+                    # 没有解决方案的对话直接跳过，不创建生成器
+                    if not conversation.solutions:
+                        continue
+                    
+                    extracted_count = sum(1 for _ in extract_from_conversation(
+                        conversation, extract_type, min_reusability_score
+                    ))
+                    
+                    if extracted_count:
+                        conversations_with_solutions += 1
+                        
+                        logger.debug(f"从对话 {conversation.id} 提取了 {extracted_count} 个解决方案")
+            finally:
+                # 出错或调用被取消时，取消尚未完成的加载任务（未开始的不再执行），
+                # 并取回已完成任务的异常，避免其被遗弃
+                for future in pending:
+                    if not future.cancel() and not future.cancelled():
+                        future.exception()
+            
+            # 去重后的解决方案按首次出现顺序排列，重复项已替换为质量更高的版本
+            all_solutions = list(extractor.extracted_solutions.values())
             
             # 获取统计信息
-            stats = self.extractor.get_extraction_statistics()
+            stats = extractor.get_extraction_statistics()
             
+            # 统计完成后不再需要提取器的去重表，尽早释放
+            del extractor, extract_from_conversation
+            
+            progress.append(f"提取完成 - 总计 {stats['total_solutions']} 个解决方案")
+            if save_solutions and all_solutions:
+                progress.append("开始保存解决方案到文件系统...")
             if ctx:
-                await ctx.info(f"提取完成 - 总计 {stats['total_solutions']} 个解决方案")
+                await ctx.info("\n".join(progress))
             
             # 保存解决方案到文件系统（如果启用）
             saved_files = []
             if save_solutions and all_solutions:
-                if ctx:
-                    await ctx.info("开始保存解决方案到文件系统...")
-                
                 saved_files = await self._save_solutions_to_files(
                     all_solutions, overwrite_existing, ctx
                 )
@@ -288,9 +485,10 @@ class ExtractSolutionsTool:
             # 构建详细的返回结果
             result = {
                 "success": True,
-                "solutions": [sol.to_dict() for sol in all_solutions],
+                # 直接返回Solution模型，由FastMCP的pydantic序列化一次性输出，避免先转dict再序列化
+                "solutions": all_solutions,
                 "total_extracted": len(all_solutions),
-                "conversations_processed": len(conversations_to_process),
+                "conversations_processed": conversations_processed,
                 "conversations_with_solutions": conversations_with_solutions,
                 "extraction_summary": self._generate_extraction_summary(stats, extract_type),
                 "statistics": {
@@ -314,16 +512,71 @@ class ExtractSolutionsTool:
             return result
             
         except Exception as e:
-            logger.error(f"解决方案提取失败: {str(e)}", exc_info=True)
+            error_msg = str(e)
+            logger.error(f"解决方案提取失败: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "success": False,
-                "error": str(e),
+                "error": error_msg,
                 "error_type": type(e).__name__,
                 "solutions": [],
                 "total_extracted": 0,
-                "extraction_summary": f"提取失败: {str(e)}"
+                "extraction_summary": f"提取失败: {error_msg}"
             }
     
+    def _write_one_type_file(
+        self,
+        solution_type: str,
+        type_solutions: List[Solution],
+        overwrite_existing: bool,
+        timestamp: str
+    ) -> Optional[str]:
+        """
+        同步写入单个类型的解决方案文件，在线程池中执行
+        
+        Args:
+            solution_type: 解决方案类型
+            type_solutions: 该类型的解决方案列表
+            overwrite_existing: 是否覆盖已存在的文件
+            timestamp: 文件名时间戳
+            
+        Returns:
+            Optional[str]: 保存的文件路径；文件已存在且不覆盖时返回None
+        """
+        filename = f"extracted_{solution_type}_solutions_{timestamp}.json"
+        file_path = self.solutions_dir / filename
+        if file_path.exists() and not overwrite_existing:
+            logger.warning(f"解决方案文件已存在，跳过保存: {filename}")
+            return None
+        
+        # 每个解决方案只转换一次字典
+        solution_dicts = [solution.to_dict() for solution in type_solutions]
+        file_content = {
+            "metadata": {
+                "created_at": datetime.now().isoformat(),
+                "solution_type": solution_type,
+                "total_solutions": len(solution_dicts),
+                "extraction_source": "conversation_records",
+                "format_version": "1.0"
+            },
+            "solutions": solution_dicts
+        }
+        
+        # orjson（不可用时为标准库json）一次生成UTF-8字节，单次写入
+        _write_and_sync(file_path, _dump_json_bytes(file_content, pretty=True))
+        
+        # 元数据另存旁路文件，查看提取历史时无需解析整个解决方案文件
+        metadata = file_content["metadata"]
+        try:
+            file_path.with_name(filename + _META_SUFFIX).write_bytes(_dump_json_bytes({
+                "created_at": metadata["created_at"],
+                "solution_type": solution_type,
+                "solutions_count": metadata["total_solutions"]
+            }))
+        except OSError as e:
+            logger.warning(f"写入解决方案元数据文件失败 {filename}: {e}")
+        
+        return str(file_path)
+    
     async def _save_solutions_to_files(
         self, 
         solutions: List[Solution], 
@@ -343,54 +596,42 @@ class ExtractSolutionsTool:
         """
         saved_files = []
         
-        # 按类型分组保存
-        grouped_solutions = {"code": [], "approach": [], "pattern": []}
+        # 为每种类型创建单独的文件
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
+        # 一次遍历按类型分组
+        grouped_solutions = {solution_type: [] for solution_type in _SOLUTION_TYPES}
+        get_type = attrgetter("type")
         for solution in solutions:
-            grouped_solutions[solution.type].append(solution)
+            grouped_solutions[get_type(solution)].append(solution)
         
-        # 为每种类型创建单独的文件
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 每种类型的转换、序列化和写入整体放到线程池，事件循环只等待结果
+        pending = [(solution_type, type_solutions) for solution_type, type_solutions in grouped_solutions.items() if type_solutions]
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._write_one_type_file, solution_type, type_solutions, overwrite_existing, timestamp)
+                for solution_type, type_solutions in pending
+            ),
+            return_exceptions=True
+        )
         
-        for solution_type, type_solutions in grouped_solutions.items():
-            if not type_solutions:
-                continue
-            
+        notices = []
+        for (solution_type, type_solutions), result in zip(pending, results):
             filename = f"extracted_{solution_type}_solutions_{timestamp}.json"
-            file_path = self.solutions_dir / filename
-            
-            # 检查文件是否存在
-            if file_path.exists() and not overwrite_existing:
-                logger.warning(f"解决方案文件已存在，跳过保存: {filename}")
+            if isinstance(result, Exception):
+                logger.error(f"保存解决方案文件失败 {self.solutions_dir / filename}: {result}")
+                notices.append(f"保存文件失败: {filename} - {str(result)}")
+                continue
+            if result is None:
                 continue
             
-            # 准备文件内容
-            file_content = {
-                "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "solution_type": solution_type,
-                    "total_solutions": len(type_solutions),
-                    "extraction_source": "conversation_records",
-                    "format_version": "1.0"
-                },
-                "solutions": [sol.to_dict() for sol in type_solutions]
-            }
-            
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(file_content, f, indent=2, ensure_ascii=False)
-                
-                saved_files.append(str(file_path))
-                
-                if ctx:
-                    await ctx.info(f"保存 {len(type_solutions)} 个 {solution_type} 解决方案到: {filename}")
-                
-                logger.info(f"成功保存解决方案文件: {file_path}")
-                
-            except Exception as e:
-                logger.error(f"保存解决方案文件失败 {file_path}: {e}")
-                if ctx:
-                    await ctx.info(f"保存文件失败: {filename} - {str(e)}")
+            saved_files.append(result)
+            notices.append(f"保存 {len(type_solutions)} 个 {solution_type} 解决方案到: {filename}")
+            logger.info(f"成功保存解决方案文件: {result}")
+        
+        # 保存结果一次性发送，减少通知往返
+        if ctx and notices:
+            await ctx.info("\n".join(notices))
         
         return saved_files
     
@@ -440,8 +681,48 @@ class ExtractSolutionsTool:
         if stats["unique_languages"] > 0:
             summary_parts.append(f"涉及 {stats['unique_languages']} 种编程语言")
         
+        if stats["near_duplicates"]:
+            summary_parts.append(f"{len(stats['near_duplicates'])} 个代码解决方案疑似近似重复（均已保留）")
+        
         return "；".join(summary_parts)
     
+    @staticmethod
+    def _read_history_metadata(file_path: Path) -> Dict[str, Any]:
+        """
+        读取提取文件的元数据（created_at、solution_type、solutions_count）
+        
+        优先读取保存时写出的旁路文件；旧文件没有旁路文件时，安装了ijson则只流式解析
+        文件开头的metadata块，否则完整解析文件。
+        
+        Args:
+            file_path: 解决方案提取文件路径
+            
+        Returns:
+            Dict[str, Any]: 元数据字典
+        """
+        try:
+            return _load_json(file_path.with_name(file_path.name + _META_SUFFIX).read_bytes())
+        except FileNotFoundError:
+            pass
+        
+        if ijson is not None:
+            with open(file_path, 'rb') as f:
+                metadata = next(ijson.items(f, "metadata"), None) or {}
+            if "total_solutions" in metadata:
+                return {
+                    "created_at": metadata.get("created_at"),
+                    "solution_type": metadata.get("solution_type"),
+                    "solutions_count": metadata["total_solutions"]
+                }
+        
+        file_data = _load_json(file_path.read_bytes())
+        metadata = file_data.get("metadata", {})
+        return {
+            "created_at": metadata.get("created_at"),
+            "solution_type": metadata.get("solution_type"),
+            "solutions_count": len(file_data.get("solutions", []))
+        }
+    
     def get_extraction_history(self) -> Dict[str, Any]:
         """
         获取解决方案提取历史记录
@@ -450,18 +731,22 @@ class ExtractSolutionsTool:
             Dict[str, Any]: 提取历史信息
         """
         try:
-            history_files = list(self.solutions_dir.glob("extracted_*_solutions_*.json"))
+            # os.scandir的DirEntry缓存stat结果，排序和文件大小共用一次stat调用
+            with os.scandir(self.solutions_dir) as entries:
+                history_entries = [
+                    entry for entry in entries
+                    if fnmatch.fnmatchcase(entry.name, "extracted_*_solutions_*.json")
+                ]
+            history_entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
             
             history = []
             total_solutions = 0
             
-            for file_path in sorted(history_files, key=lambda x: x.stat().st_mtime, reverse=True):
+            for entry in history_entries:
+                file_path = Path(entry.path)
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_data = json.load(f)
-                    
-                    metadata = file_data.get("metadata", {})
-                    solutions_count = len(file_data.get("solutions", []))
+                    metadata = self._read_history_metadata(file_path)
+                    solutions_count = metadata["solutions_count"]
                     total_solutions += solutions_count
                     
                     history.append({
@@ -470,7 +755,7 @@ class ExtractSolutionsTool:
                         "created_at": metadata.get("created_at"),
                         "solution_type": metadata.get("solution_type"),
                         "solutions_count": solutions_count,
-                        "file_size_kb": round(file_path.stat().st_size / 1024, 2)
+                        "file_size_kb": round(entry.stat().st_size / 1024, 2)
                     })
                     
                 except Exception as e:
@@ -97,27 +97,31 @@ class InjectContextTool:
                 "injection_summary": str
             }
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
-            if ctx:
-                await ctx.info(f"开始为查询注入上下文: '{current_query[:50]}'")
-                await ctx.info(f"处理 {len(search_results)} 个搜索结果")
-            
             # 参数验证
-            if not current_query or not current_query.strip():
+            current_query = current_query.strip() if current_query else ""
+            if not current_query:
                 raise ValueError("当前查询不能为空")
             
             if not isinstance(search_results, list):
                 raise ValueError("search_results 必须是列表类型")
             
+            # 进度信息在结束时一次性发送，减少通知往返
+            progress = [
+                f"开始为查询注入上下文: '{current_query[:50]}'",
+                f"处理 {len(search_results)} 个搜索结果"
+            ]
+            
             # 格式化搜索结果供AI处理
             formatted_results = self._format_search_results_for_ai(search_results)
             
-            processing_time = (time.time() - start_time) * 1000
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e6
             
+            progress.append("上下文注入完成，引导AI进行问题解决应用")
             if ctx:
-                await ctx.info(f"上下文注入完成，引导AI进行问题解决应用")
+                await ctx.info("\n".join(progress))
             
             # 返回引导AI进行问题解决应用的结构化数据
             return {
@@ -148,7 +152,7 @@ class InjectContextTool:
             if ctx:
                 await ctx.error(f"上下文注入失败: {error_msg}")
             
-            logger.error(f"上下文注入失败 - 查询: '{current_query}', 错误: {error_msg}", exc_info=True)
+            logger.error(f"上下文注入失败 - 查询: '{current_query}', 错误: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
             
             return {
                 "content": [{
@@ -159,7 +163,7 @@ class InjectContextTool:
                         "action_needed": "handle_error"
                     }, indent=2, ensure_ascii=False)
                 }],
-                "processing_time_ms": (time.time() - start_time) * 1000,
+                "processing_time_ms": (time.perf_counter_ns() - start_ns) / 1e6,
                 "total_items": 0,
                 "injection_summary": f"注入失败: {error_msg}"
             }
@@ -13,6 +13,7 @@ Save Conversation MCP工具实现模块
 - 扩展性：支持多种AI分析结果格式
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -139,22 +140,17 @@ class SaveConversationTool:
             Dict[str, Any]: 保存结果
         """
         try:
-            if ctx:
-                await ctx.info(f"开始保存对话: {title}")
-            
-            # 1. 基础内容验证
-            if not content or not content.strip():
+            # 1. 基础内容验证（直接使用原始内容，让AI处理内容清理）
+            cleaned_content = content.strip() if content else ""
+            if not cleaned_content:
                 raise ValueError("对话内容为空")
             
-            # 直接使用原始内容，让AI处理内容清理
-            cleaned_content = content.strip()
-            
             # 2-5. 使用AI分析结果
             if not ai_summary:
                 raise ValueError("需要AI分析结果才能保存对话。请先调用conversation_analysis_prompt获取分析结果。")
             
-            if ctx:
-                await ctx.info("使用AI分析结果进行处理...")
+            # 进度信息在结束时一次性发送，减少通知往返
+            progress = [f"开始保存对话: {title}", "使用AI分析结果进行处理..."]
             
             # 使用AI分析结果
             summary = ai_summary
@@ -168,15 +164,14 @@ class SaveConversationTool:
             # 6. 检查重复（如果启用）
             duplicates = []
             if check_duplicates:
-                if ctx:
-                    await ctx.info("检查重复对话...")
+                progress.append("检查重复对话...")
                 # 加载最近的对话记录进行重复检测
-                recent_conversations = self._load_recent_conversations(limit=50)
+                recent_conversations = await asyncio.to_thread(self._load_recent_conversations, limit=50)
                 duplicates = DuplicateDetector.find_duplicates(
                     title, cleaned_content, recent_conversations
                 )
-                if ctx and duplicates:
-                    await ctx.info(f"发现 {len(duplicates)} 个重复对话")
+                if duplicates:
+                    progress.append(f"发现 {len(duplicates)} 个重复对话")
             
             # 7. 创建对话记录
             conversation = ConversationRecord(
@@ -195,18 +190,18 @@ class SaveConversationTool:
                 ]
             
             # 8. 保存到文件
-            save_success = self.file_manager.save_conversation(conversation)
+            save_success = await asyncio.to_thread(self.file_manager.save_conversation, conversation)
             
             if not save_success:
                 raise RuntimeError("文件保存失败")
             
             # 9. AI语义搜索不需要维护索引
-            if ctx:
-                await ctx.info("对话已可通过AI语义搜索查找")
+            progress.append("对话已可通过AI语义搜索查找")
             
             logger.info(f"成功保存对话: {conversation.id}")
+            progress.append(f"对话保存完成: {conversation.id}")
             if ctx:
-                await ctx.info(f"对话保存完成: {conversation.id}")
+                await ctx.info("\n".join(progress))
             
             # 10. 返回结果
             return {
@@ -233,10 +228,11 @@ class SaveConversationTool:
             }
             
         except Exception as e:
-            logger.error(f"保存对话失败: {str(e)}", exc_info=True)
+            error_msg = str(e)
+            logger.error(f"保存对话失败: {error_msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "success": False,
-                "error": str(e),
+                "error": error_msg,
                 "error_type": type(e).__name__
             }
     
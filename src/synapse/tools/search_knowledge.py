@@ -17,6 +17,7 @@
 """
 
 import logging
+import threading
 import time
 import re
 from datetime import datetime
@@ -30,6 +31,9 @@ from synapse.models.conversation import Solution
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 支持的搜索范围
+_SEARCH_FIELDS = frozenset(("title", "content", "tags", "all"))
+
 
 class SearchKnowledgeTool:
     """
@@ -75,7 +79,9 @@ class SearchKnowledgeTool:
     def search_knowledge(
         self,
         query: str,
-        search_in: str = "all"  # "title" | "content" | "tags" | "all"
+        search_in: str = "all",  # "title" | "content" | "tags" | "all"
+        include_content: bool = True,
+        cancel_event: Optional[threading.Event] = None
     ) -> dict:
         """
         简单grep搜索工具 - 让AI提供关键词，工具负责搜索
@@ -95,6 +101,8 @@ class SearchKnowledgeTool:
         Args:
             query: 搜索关键词（由AI理解用户问题后生成）
             search_in: 搜索范围（title/content/tags/all）
+            include_content: 是否在结果中包含解决方案完整内容（为False时只返回snippet）
+            cancel_event: 取消信号，调用方放弃请求后置位，搜索在各阶段之间及逐条匹配时检查并提前结束
             
         Returns:
             dict: 搜索结果
@@ -114,25 +122,29 @@ class SearchKnowledgeTool:
                 "suggestion": "建议AI尝试搜索其他相关关键词如 'asyncio', '异步编程'"
             }
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             logger.info(f"简化grep搜索: '{query}' in {search_in}")
             
             # 参数验证
-            if not query or not query.strip():
+            query = query.strip() if query else ""
+            if not query:
                 raise ValueError("搜索查询不能为空")
             
                 
-            if search_in not in ["title", "content", "tags", "all"]:
+            if search_in not in _SEARCH_FIELDS:
                 raise ValueError("search_in必须是 'title', 'content', 'tags', 'all' 之一")
             
             # 加载所有解决方案
             all_solutions = self._load_solutions()
             logger.debug(f"加载了 {len(all_solutions)} 个解决方案")
+            self._check_cancelled(cancel_event)
             
             # 执行简单grep搜索
-            results = self._simple_grep_search(query.strip().lower(), search_in, all_solutions)
+            results = self._simple_grep_search(
+                query.lower(), search_in, all_solutions, include_content, cancel_event
+            )
             
             # 按时间倒序排列，最新的优先
             results.sort(key=lambda x: x.get('created_at', ''), reverse=True)
@@ -140,7 +152,7 @@ class SearchKnowledgeTool:
             # 限制结果数量为最新100个
             results = results[:100]
             
-            processing_time = (time.time() - start_time) * 1000
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e6
             
             # 生成AI后续搜索建议
             suggestion = self._generate_search_suggestion(query, len(results))
@@ -156,16 +168,22 @@ class SearchKnowledgeTool:
             
         except Exception as e:
             error_msg = f"搜索失败: {str(e)}"
-            logger.error(error_msg, exc_info=True)
+            logger.error(error_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "query": query,
                 "total_found": 0,
                 "search_area": search_in,
                 "results": [],
                 "error": error_msg,
-                "processing_time_ms": (time.time() - start_time) * 1000
+                "processing_time_ms": (time.perf_counter_ns() - start_ns) / 1e6
             }
     
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+        """调用方已取消请求时中止搜索"""
+        if cancel_event is not None and cancel_event.is_set():
+            raise RuntimeError("搜索已取消")
+    
     def _load_solutions(self) -> List[Solution]:
         """加载所有解决方案"""
         try:
@@ -174,7 +192,14 @@ class SearchKnowledgeTool:
             logger.warning(f"加载解决方案失败: {e}")
             return []
     
-    def _simple_grep_search(self, query: str, search_in: str, solutions: List[Solution]) -> List[Dict]:
+    def _simple_grep_search(
+        self,
+        query: str,
+        search_in: str,
+        solutions: List[Solution],
+        include_content: bool = True,
+        cancel_event: Optional[threading.Event] = None
+    ) -> List[Dict]:
         """
         执行简单的grep搜索 - 核心搜索逻辑
         
@@ -182,6 +207,8 @@ class SearchKnowledgeTool:
             query: 小写的搜索查询
             search_in: 搜索范围
             solutions: 解决方案列表
+            include_content: 是否附带完整内容
+            cancel_event: 取消信号
             
         Returns:
             List[Dict]: 匹配的结果列表
@@ -190,6 +217,7 @@ class SearchKnowledgeTool:
         search_terms = query.split()  # 将查询分解为多个词
         
         for solution in solutions:
+            self._check_cancelled(cancel_event)
             try:
                 match_info = self._check_solution_match(solution, search_terms, search_in)
                 if match_info:
@@ -197,7 +225,6 @@ class SearchKnowledgeTool:
                         "id": solution.id,
                         "title": solution.description,
                         "snippet": self._generate_snippet(solution, search_terms),
-                        "content": solution.content,  # 添加完整内容
                         "type": solution.type,
                         "language": solution.language,
                         "created_at": solution.to_dict().get("created_at", ""),
@@ -205,6 +232,8 @@ class SearchKnowledgeTool:
                         "reusability_score": solution.reusability_score,
                         "match_reason": match_info["reason"]
                     }
+                    if include_content:
+                        result["content"] = solution.content  # 添加完整内容
                     results.append(result)
                     
             except Exception as e:
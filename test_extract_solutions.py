@@ -117,8 +117,8 @@ async def test_extract_solutions():
     
     if result2["success"]:
         print(f"    ✅ 代码解决方案提取: {result2['total_extracted']} 个")
-        code_solutions = [s for s in result2['solutions'] if s['type'] == 'code']
-        print(f"    🐍 代码语言: {[s['language'] for s in code_solutions]}")
+        code_solutions = [s for s in result2['solutions'] if s.type == 'code']
+        print(f"    🐍 代码语言: {[s.language for s in code_solutions]}")
     else:
         print(f"    ❌ 按类型提取失败: {result2['error']}")
     
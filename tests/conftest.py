@@ -0,0 +1,21 @@
+"""
+测试公共fixture
+
+所有测试都在临时目录中运行：XDG目录指向 tmp_path，并清空 platformdirs 结果缓存，
+避免读写用户真实的 Synapse 存储。
+"""
+
+import pytest
+
+from synapse.storage import paths as paths_module
+from synapse.storage.paths import StoragePaths
+
+
+@pytest.fixture
+def storage_paths(tmp_path, monkeypatch) -> StoragePaths:
+    """指向临时目录的 StoragePaths"""
+    for name in ("XDG_DATA_HOME", "XDG_CONFIG_HOME", "XDG_CACHE_HOME"):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    paths_module._platform_dirs.cache_clear()
+    yield StoragePaths()
+    paths_module._platform_dirs.cache_clear()
@@ -0,0 +1,186 @@
+"""解决方案提取器与提取工具的测试"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from synapse.models.conversation import ConversationRecord, create_solution
+from synapse.tools import extract_solutions
+from synapse.tools.extract_solutions import SolutionExtractor, _simhash
+
+
+def _code(content, language="python", score=0.7):
+    return create_solution("code", content, "代码片段", language=language, reusability_score=score)
+
+
+def _extract(extractor, *solutions):
+    conversation = ConversationRecord(title="测试", content="内容", solutions=list(solutions))
+    return list(extractor.extract_from_conversation(conversation))
+
+
+@pytest.fixture
+def fingerprints(monkeypatch):
+    """按内容指定SimHash指纹，精确控制汉明距离"""
+    mapping = {}
+    monkeypatch.setattr(extract_solutions, "_simhash", lambda content: mapping[content])
+    return mapping
+
+
+def test_simhash_distinguishes_operators():
+    assert _simhash("return a + b") != _simhash("return a - b")
+    assert _simhash("x == y") != _simhash("x != y")
+
+
+def test_operator_variants_are_both_kept():
+    extractor = SolutionExtractor()
+    
+    added = _extract(extractor, _code("def f(a, b):\n    return a + b"), _code("def f(a, b):\n    return a - b"))
+    
+    assert len(added) == 2
+    assert extractor.get_extraction_statistics()["near_duplicates"] == []
+
+
+def test_near_duplicate_within_threshold_is_kept_and_flagged(fingerprints):
+    base = (1 << 127) | 0xF0F0
+    fingerprints.update({"original": base, "close": base ^ 0b111, "far": base ^ (0b1111 << 20)})
+    extractor = SolutionExtractor()
+    original, close, far = _code("original"), _code("close"), _code("far")
+    
+    added = _extract(extractor, original, close, far)
+    
+    # 距离为3的标记为疑似重复，距离为4的不标记；三者都保留
+    assert [solution.id for solution in added] == [original.id, close.id, far.id]
+    assert extractor.get_extraction_statistics()["near_duplicates"] == [
+        {"solution_id": close.id, "similar_to": original.id}
+    ]
+
+
+def test_near_duplicate_requires_same_language(fingerprints):
+    fingerprints.update({"python": 1 << 100, "shell": 1 << 100})
+    extractor = SolutionExtractor()
+    
+    added = _extract(extractor, _code("python"), _code("shell", language="bash"))
+    
+    assert len(added) == 2
+    assert extractor.get_extraction_statistics()["near_duplicates"] == []
+
+
+def test_exact_duplicate_keeps_higher_score():
+    extractor = SolutionExtractor()
+    low, high = _code("print('x')", score=0.5), _code("PRINT('x')", score=0.9)
+    
+    added = _extract(extractor, low, high)
+    
+    assert added == [low]
+    assert list(extractor.extracted_solutions.values()) == [high]
+
+
+@pytest.fixture
+def tool(storage_paths):
+    from synapse.storage.initializer import StorageInitializer
+    
+    assert StorageInitializer(storage_paths).initialize_storage(show_info=False)[0]
+    return extract_solutions.ExtractSolutionsTool(storage_paths)
+
+
+def _save_conversations(tool, count):
+    # 显式编号ID：自动生成的ID只有3位十六进制后缀，批量创建时可能重复
+    today = datetime.now().strftime('%Y%m%d')
+    conversations = [
+        ConversationRecord(
+            id=f"conv_{today}_{i:03d}", title=f"对话{i}", content="内容",
+            solutions=[_code(f"value_{i} = {i} * 2")]
+        )
+        for i in range(count)
+    ]
+    for conversation in conversations:
+        assert tool.file_manager.save_conversation(conversation)
+    return conversations
+
+
+@pytest.mark.asyncio
+async def test_concurrent_extractions_do_not_share_state(tool):
+    conversations = _save_conversations(tool, 30)
+    target = conversations[0]
+    
+    results = await asyncio.gather(*(
+        tool.extract_solutions(conversation_id=target.id if i % 2 else None, save_solutions=False)
+        for i in range(6)
+    ))
+    
+    for i, result in enumerate(results):
+        assert result["success"], result
+        assert result["total_extracted"] == (1 if i % 2 else 30)
+
+
+class _FailingProgressCtx:
+    """首次报告进度即抛出异常的MCP上下文"""
+    
+    async def report_progress(self, *args, **kwargs):
+        raise RuntimeError("client disconnected")
+    
+    async def info(self, message):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_cancels_queued_loads(tool, monkeypatch):
+    conversations = _save_conversations(tool, 80)
+    gate = threading.Event()
+    calls = []
+    
+    def blocking_load(file_path):
+        calls.append(file_path)
+        gate.wait(5)
+        return None
+    
+    monkeypatch.setattr(tool.file_manager, "load_conversation_file", blocking_load)
+    
+    result = await tool.extract_solutions(save_solutions=False, ctx=_FailingProgressCtx())
+    # 取消经事件循环回调传递到线程池中的任务
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.sleep(0.2)
+    
+    assert not result["success"]
+    # 只有已在线程池中开始的加载会执行，排队中的全部被取消
+    assert 0 < len(calls) < len(conversations)
+
+
+@pytest.mark.asyncio
+async def test_extraction_bounds_in_flight_loads(tool, monkeypatch):
+    _save_conversations(tool, 10)
+    monkeypatch.setattr(extract_solutions, "_LOAD_WINDOW", 3)
+    gate = threading.Event()
+    submitted = []
+    
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+    
+    executor = RecordingExecutor(max_workers=8)
+    monkeypatch.setattr(extract_solutions, "_get_io_executor", lambda: executor)
+    real_load = tool.file_manager.load_conversation_file
+    
+    def gated_load(file_path):
+        gate.wait(5)
+        return real_load(file_path)
+    
+    monkeypatch.setattr(tool.file_manager, "load_conversation_file", gated_load)
+    
+    task = asyncio.create_task(tool.extract_solutions(save_solutions=False))
+    await asyncio.sleep(0.1)
+    # 第一个对话尚未加载完成时，只提交了窗口内的加载任务
+    assert len(submitted) == 3
+    
+    gate.set()
+    result = await task
+    executor.shutdown()
+    
+    assert result["success"], result
+    assert result["total_extracted"] == 10
+    assert len(submitted) == 10
@@ -0,0 +1,372 @@
+"""FileManager 及其模块级工具函数的测试"""
+
+import os
+import subprocess
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from synapse.models.conversation import ConversationRecord, create_solution
+from synapse.storage import file_manager
+from synapse.storage.file_manager import FileManager, _RWLock, _dump_json_bytes, _fast_rmtree, _load_json
+from synapse.storage.initializer import StorageInitializer
+
+
+def _join_rmtree_threads():
+    for thread in threading.enumerate():
+        if thread.name == "synapse-rmtree":
+            thread.join(timeout=10)
+
+
+def _make_tree(root):
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "file.json").write_bytes(b"{}")
+
+
+def test_fast_rmtree_waits_by_default(tmp_path):
+    _make_tree(tmp_path / "victim")
+    
+    _fast_rmtree(tmp_path / "victim")
+    
+    assert os.listdir(tmp_path) == []
+
+
+def test_fast_rmtree_background_reaps_and_falls_back(tmp_path, monkeypatch):
+    _make_tree(tmp_path / "victim")
+    started = []
+    real_popen = subprocess.Popen
+    
+    def failing_popen(command, **kwargs):
+        # 模拟删除命令失败：子进程返回非零且目录原样保留
+        process = real_popen(["false"], **kwargs)
+        started.append(process)
+        return process
+    
+    monkeypatch.setattr(file_manager.subprocess, "Popen", failing_popen)
+    
+    _fast_rmtree(tmp_path / "victim", wait=False)
+    _join_rmtree_threads()
+    
+    assert started and started[0].returncode is not None
+    assert os.listdir(tmp_path) == []
+
+
+def test_cleanup_storage_leaves_no_trash(storage_paths):
+    storage_initializer = StorageInitializer(storage_paths)
+    assert storage_initializer.initialize_storage(show_info=False)[0]
+    parents = {
+        storage_paths.get_data_dir().parent,
+        storage_paths.get_config_dir().parent,
+        storage_paths.get_cache_dir().parent,
+    }
+    
+    success, _ = storage_initializer.cleanup_storage(confirm=True)
+    
+    assert success
+    for parent in parents:
+        assert [name for name in os.listdir(parent) if ".trash-" in name] == []
+    assert not storage_paths.get_data_dir().exists()
+
+
+@pytest.fixture
+def manager(storage_paths):
+    assert StorageInitializer(storage_paths).initialize_storage(show_info=False)[0]
+    return FileManager(storage_paths)
+
+
+def test_import_recopies_deleted_or_edited_destination(manager, storage_paths, tmp_path):
+    source = tmp_path / "export" / "solutions"
+    source.mkdir(parents=True)
+    (source / "sol.json").write_bytes(b'{"id": 1}')
+    target = storage_paths.get_solutions_dir() / "sol.json"
+    
+    assert manager.import_data(tmp_path / "export")
+    assert target.read_bytes() == b'{"id": 1}'
+    
+    # 导入记录命中，但目标文件已被删除
+    target.unlink()
+    assert manager.import_data(tmp_path / "export")
+    assert target.read_bytes() == b'{"id": 1}'
+    
+    # 导入记录命中，但目标文件已被修改
+    target.write_bytes(b'{"id": 2, "edited": true}')
+    assert manager.import_data(tmp_path / "export")
+    assert target.read_bytes() == b'{"id": 1}'
+
+
+def test_import_skips_unchanged_files(manager, storage_paths, tmp_path, monkeypatch):
+    source = tmp_path / "export" / "solutions"
+    source.mkdir(parents=True)
+    (source / "sol.json").write_bytes(b'{"id": 1}')
+    assert manager.import_data(tmp_path / "export")
+    
+    copied = []
+    real_copy = file_manager._fast_copy
+    
+    def recording_copy(src, dst, **kwargs):
+        copied.append(os.fspath(src))
+        return real_copy(src, dst, **kwargs)
+    
+    monkeypatch.setattr(file_manager, "_fast_copy", recording_copy)
+    assert manager.import_data(tmp_path / "export")
+    
+    # 导入前备份仍会复制，来源目录中未变化的文件不再复制
+    assert str(source / "sol.json") not in copied
+
+
+def test_loading_legacy_conversation_does_not_rewrite_file(manager):
+    conversation = ConversationRecord(
+        title="旧数据", content="legacy",
+        solutions=[create_solution("code", "print('hi')", "打印", language="python")]
+    )
+    assert manager.save_conversation(conversation)
+    file_path = manager._get_conversation_file_path(conversation.id)
+    
+    # 模拟旧版本写入的文件：代码方案缺少language，且没有schema_version
+    data = _load_json(file_path.read_bytes())
+    data.pop("schema_version", None)
+    data["solutions"][0]["language"] = None
+    legacy = _dump_json_bytes(data)
+    file_path.write_bytes(legacy)
+    
+    loaded = manager.load_conversation(conversation.id)
+    manager.flush()
+    
+    assert loaded is not None
+    assert loaded.solutions[0].language
+    assert file_path.read_bytes() == legacy
+
+
+def test_iter_conversation_files_newest_first_with_date_range(manager, storage_paths):
+    conversations_dir = storage_paths.get_conversations_dir()
+    for year, month, conversation_id in [
+        ("2023", "12", "conv_20231201_001"),
+        ("2024", "01", "conv_20240105_001"),
+        ("2024", "01", "conv_20240120_002"),
+        ("2024", "03", "conv_20240301_001"),
+    ]:
+        month_dir = conversations_dir / year / month
+        month_dir.mkdir(parents=True, exist_ok=True)
+        (month_dir / f"{conversation_id}.json").write_bytes(b"{}")
+    
+    names = [path.stem for path in manager.iter_conversation_files()]
+    assert names == ["conv_20240301_001", "conv_20240120_002", "conv_20240105_001", "conv_20231201_001"]
+    
+    in_range = manager.iter_conversation_files(start_date=date(2024, 1, 1), end_date=date(2024, 2, 1))
+    assert [path.stem for path in in_range] == ["conv_20240120_002", "conv_20240105_001"]
+    assert manager.list_conversations(limit=2) == names[:2]
+
+
+def test_flush_syncs_pending_writes_and_dirty_indexes(manager, storage_paths, monkeypatch):
+    # 同步间隔足够长，后台线程不会在断言前自行同步
+    manager.sync_interval = 3600
+    synced = []
+    real_fsync = os.fsync
+    test_thread = threading.current_thread()
+    
+    def recording_fsync(fd):
+        # 只记录本线程（调用flush）发起的同步，忽略其他测试遗留的后台线程
+        if threading.current_thread() is test_thread:
+            synced.append(fd)
+        real_fsync(fd)
+    
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    conversation = ConversationRecord(title="组提交", content="内容")
+    
+    assert manager.save_conversation(conversation)
+    file_path = manager._get_conversation_file_path(conversation.id)
+    index_path = storage_paths.get_indexes_dir() / "conversation_index.json"
+    assert file_path in manager._pending_sync
+    assert "_id_index" in manager._dirty_indexes
+    
+    manager.flush()
+    
+    assert not manager._pending_sync and not manager._dirty_indexes
+    assert synced  # 文件及其所在目录
+    assert conversation.id in _load_json(index_path.read_bytes())
+
+
+def test_background_sync_thread_writes_indexes(manager, storage_paths):
+    manager.sync_interval = 0.01
+    conversation = ConversationRecord(title="后台同步", content="内容")
+    assert manager.save_conversation(conversation)
+    index_path = storage_paths.get_indexes_dir() / "conversation_index.json"
+    
+    deadline = time.monotonic() + 5
+    while (manager._pending_sync or manager._dirty_indexes) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert manager._sync_thread.name == "synapse-fsync"
+    assert not manager._pending_sync and not manager._dirty_indexes
+    assert conversation.id in _load_json(index_path.read_bytes())
+
+
+def test_id_index_rebuilt_when_corrupt(manager, storage_paths):
+    conversation = ConversationRecord(title="索引", content="内容")
+    assert manager.save_conversation(conversation)
+    manager.flush()
+    index_path = storage_paths.get_indexes_dir() / "conversation_index.json"
+    index_path.write_bytes(b"not json")
+    
+    reopened = FileManager(storage_paths)
+    
+    index = reopened._get_id_index()
+    assert index[conversation.id] == manager._get_conversation_file_path(conversation.id).relative_to(
+        storage_paths.get_conversations_dir()
+    ).as_posix()
+    assert "_id_index" in reopened._dirty_indexes
+    
+    assert reopened.delete_conversation(conversation.id)
+    assert conversation.id not in reopened._get_id_index()
+
+
+def test_reference_counts_kept_in_index(manager, storage_paths):
+    solution = create_solution("approach", "先写测试", "测试驱动", reusability_score=0.8)
+    assert manager.save_solution(solution)
+    solution_file = manager._get_solution_file_path(solution.id)
+    original = solution_file.read_bytes()
+    
+    assert manager.update_solution_reference_count(solution.id)
+    assert manager.update_solution_reference_count(solution.id)
+    manager.flush()
+    
+    # 引用计数只写入索引，解决方案文件保持不变
+    assert solution_file.read_bytes() == original
+    loaded = FileManager(storage_paths).load_solution(solution.id)
+    assert loaded.reference_count == 2
+    assert loaded.last_referenced is not None
+    assert not manager.update_solution_reference_count("sol_missing")
+
+
+def test_hardlink_backup_keeps_previous_version(manager, tmp_path):
+    target = tmp_path / "record.json"
+    target.write_bytes(b'{"version": 1}')
+    
+    backup_info = manager._create_backup(target)
+    
+    # 同一文件系统上备份是硬链接；原文件未被替换时恢复为空操作
+    assert os.path.samefile(backup_info.backup_path, target)
+    assert manager._restore_from_backup(backup_info)
+    
+    # 原子写入换入新inode，备份链接仍指向旧内容
+    file_manager._write_atomic(target, b'{"version": 2}')
+    assert backup_info.backup_path.read_bytes() == b'{"version": 1}'
+    
+    assert manager._restore_from_backup(backup_info)
+    assert target.read_bytes() == b'{"version": 1}'
+
+
+def test_rw_lock_shares_readers_and_blocks_behind_waiting_writer():
+    lock = _RWLock()
+    assert lock.acquire(False, 0.1)
+    assert lock.acquire(False, 0.1)
+    assert not lock.acquire(True, 0.05)
+    
+    writer_acquired = threading.Event()
+    
+    def writer():
+        if lock.acquire(True, 5):
+            writer_acquired.set()
+            lock.release(True)
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not lock._waiting_writers and time.monotonic() < deadline:
+        time.sleep(0.001)
+    
+    # 有写者等待时不接纳新读者
+    assert not lock.acquire(False, 0.05)
+    lock.release(False)
+    lock.release(False)
+    thread.join(5)
+    
+    assert writer_acquired.is_set()
+    assert lock.acquire(False, 0.1)
+    lock.release(False)
+
+
+def test_file_lock_cache_drops_released_paths(manager, tmp_path):
+    target = tmp_path / "locked.json"
+    
+    with manager._file_lock(target, 'w') as f:
+        f.write("{}")
+        assert str(target.absolute()) in manager._file_locks
+        with pytest.raises(TimeoutError):
+            manager.lock_timeout = 0.05
+            with manager._file_lock(target, 'r'):
+                pass
+    
+    assert manager._file_locks == {}
+    with manager._file_lock(target, 'r') as f:
+        assert f.read() == "{}"
+
+
+def test_save_recovers_after_other_instance_overwrite_import(manager, storage_paths, tmp_path):
+    assert manager.save_conversation(ConversationRecord(title="导入前", content="内容"))
+    
+    # 另一个实例覆盖导入，conversations目录被整体替换，本实例的目录缓存已过期
+    (tmp_path / "export" / "conversations").mkdir(parents=True)
+    assert FileManager(storage_paths).import_data(tmp_path / "export", merge_mode="overwrite")
+    
+    conversation = ConversationRecord(title="导入后", content="内容")
+    assert manager.save_conversation(conversation)
+    assert manager.load_conversation(conversation.id) is not None
+
+
+def test_index_write_back_merges_other_instances(manager, storage_paths):
+    other = FileManager(storage_paths)
+    first = ConversationRecord(title="实例A", content="内容")
+    second = ConversationRecord(title="实例B", content="内容")
+    solutions = [
+        create_solution("approach", f"复用连接池{i}", "连接池", reusability_score=0.8) for i in range(2)
+    ]
+    for solution in solutions:
+        assert manager.save_solution(solution)
+    manager.flush()
+    
+    # 两个实例先各自加载索引，此后的改动互不可见
+    other._get_id_index()
+    other._get_ref_counts()
+    
+    assert manager.save_conversation(first)
+    assert manager.update_solution_reference_count(solutions[0].id)
+    manager.flush()
+    assert other.save_conversation(second)
+    assert other.update_solution_reference_count(solutions[1].id)
+    other.flush()
+    
+    indexes_dir = storage_paths.get_indexes_dir()
+    index = _load_json((indexes_dir / "conversation_index.json").read_bytes())
+    assert first.id in index and second.id in index
+    assert first.id in other._get_id_index()
+    ref_counts = _load_json((indexes_dir / "solution_refcounts.json").read_bytes())
+    assert {solution_id: entry[0] for solution_id, entry in ref_counts.items()} == {
+        solutions[0].id: 1, solutions[1].id: 1
+    }
+
+
+def test_append_import_keeps_local_reference_counts(manager, storage_paths, tmp_path):
+    local = create_solution("approach", "本地方案", "本地", reusability_score=0.8)
+    assert manager.save_solution(local)
+    for _ in range(3):
+        assert manager.update_solution_reference_count(local.id)
+    
+    # 另一存储导出的数据：同一解决方案计数较小，另有一个本地没有的解决方案
+    export_indexes = tmp_path / "export" / "indexes"
+    export_indexes.mkdir(parents=True)
+    (export_indexes / "solution_refcounts.json").write_bytes(_dump_json_bytes({
+        local.id: [1, "2020-01-01T00:00:00"],
+        "sol_remote": [5, "2021-01-01T00:00:00"],
+    }))
+    (export_indexes / "conversation_index.json").write_bytes(b"{}")
+    
+    assert manager.import_data(tmp_path / "export", merge_mode="append")
+    
+    assert manager.load_solution(local.id).reference_count == 3
+    manager.flush()
+    ref_counts = _load_json((storage_paths.get_indexes_dir() / "solution_refcounts.json").read_bytes())
+    assert ref_counts[local.id][0] == 3
+    assert ref_counts["sol_remote"] == [5, "2021-01-01T00:00:00"]
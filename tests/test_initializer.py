@@ -0,0 +1,119 @@
+"""StorageInitializer 及其模块级工具函数的测试"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from synapse.storage import initializer
+from synapse.storage.file_manager import _load_json, _write_atomic
+from synapse.storage.initializer import StorageInitializer, _atomic_write_json
+
+
+def test_atomic_write_json_round_trip(tmp_path):
+    target = tmp_path / "config.json"
+    _atomic_write_json(target, {"名称": "synapse", "values": [1, 2]})
+    
+    assert _load_json(target.read_bytes()) == {"名称": "synapse", "values": [1, 2]}
+    # 与 file_manager 共用同一序列化：2空格缩进的UTF-8
+    assert target.read_text(encoding="utf-8").startswith('{\n  "')
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+def test_write_atomic_failure_keeps_target_and_removes_temp(tmp_path):
+    target = tmp_path / "data.json"
+    target.write_bytes(b"old")
+    
+    with pytest.raises(TypeError):
+        _write_atomic(target, "not bytes")
+    
+    assert target.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_initialize_storage_creates_marker(storage_paths):
+    storage_initializer = StorageInitializer(storage_paths)
+    assert not storage_initializer.is_initialized()
+    
+    success, _ = storage_initializer.initialize_storage(show_info=False)
+    
+    assert success
+    assert storage_initializer.is_initialized()
+    marker = _load_json(storage_initializer.initialization_marker.read_bytes())
+    assert marker["python_version"][:2] == list(sys.version_info[:2])
+    assert (storage_paths.get_indexes_dir() / initializer.INDEXES_EMPTY_MARKER).exists()
+    assert StorageInitializer(storage_paths).is_initialized()
+
+
+def test_dir_size_counts_file_bytes_only(tmp_path, monkeypatch):
+    monkeypatch.delenv("SYNAPSE_IO_URING", raising=False)
+    nested = tmp_path / "2024" / "01" / "deep"
+    nested.mkdir(parents=True)
+    (nested / "conv.json").write_bytes(b"12345")
+    (tmp_path / "empty").mkdir()
+    
+    # 目录项本身不计入大小
+    assert initializer._dir_size_fast(str(tmp_path)) == 5
+    assert initializer._walk_size(str(tmp_path)) == 5
+
+
+def test_uring_size_matches_walk(tmp_path, monkeypatch):
+    pytest.importorskip("liburing")
+    monkeypatch.setenv("SYNAPSE_IO_URING", "1")
+    if not initializer._io_uring_enabled():
+        pytest.skip("io_uring requires Linux 5.6+")
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "conv.json").write_bytes(b"12345")
+    (tmp_path / "index.json").write_bytes(b"{}")
+    
+    assert initializer._uring_size(str(tmp_path)) == initializer._walk_size(str(tmp_path)) == 7
+    assert initializer._dir_size_fast(str(tmp_path)) == 7
+
+
+def _join_size_refresh():
+    for thread in threading.enumerate():
+        if thread.name == "synapse-size-refresh":
+            thread.join(timeout=10)
+
+
+def test_storage_status_uses_size_cache(storage_paths):
+    storage_initializer = StorageInitializer(storage_paths)
+    assert storage_initializer.initialize_storage(show_info=False)[0]
+    cache_file = storage_paths.get_indexes_dir() / initializer.SIZE_CACHE_FILE
+    cache_file.unlink(missing_ok=True)
+    
+    first = storage_initializer.get_storage_status()
+    assert cache_file.exists()
+    
+    # 缓存未过期时新增文件不会触发重新统计
+    (storage_paths.get_solutions_dir() / "new.json").write_bytes(b"x" * 100)
+    second = storage_initializer.get_storage_status()
+    assert second["directory_status"]["solutions"]["size_bytes"] == first["directory_status"]["solutions"]["size_bytes"]
+    
+    # 过期的缓存先原样返回，再由后台线程刷新
+    stale = time.time() - initializer._SIZE_CACHE_MAX_AGE - 10
+    os.utime(cache_file, (stale, stale))
+    third = storage_initializer.get_storage_status()
+    assert third["total_size_bytes"] == second["total_size_bytes"]
+    _join_size_refresh()
+    
+    refreshed = _load_json(cache_file.read_bytes())
+    assert refreshed["solutions"] == first["directory_status"]["solutions"]["size_bytes"] + 100
+
+
+def test_import_invalidates_size_cache(storage_paths, tmp_path):
+    from synapse.storage.file_manager import FileManager
+    
+    storage_initializer = StorageInitializer(storage_paths)
+    assert storage_initializer.initialize_storage(show_info=False)[0]
+    storage_initializer.get_storage_status()
+    cache_file = storage_paths.get_indexes_dir() / initializer.SIZE_CACHE_FILE
+    assert cache_file.exists()
+    
+    (tmp_path / "export" / "solutions").mkdir(parents=True)
+    (tmp_path / "export" / "solutions" / "sol.json").write_bytes(b"[]")
+    assert FileManager(storage_paths).import_data(tmp_path / "export")
+    
+    assert not cache_file.exists()
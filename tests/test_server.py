@@ -0,0 +1,60 @@
+"""server 模块的存储信息缓存测试"""
+
+import pytest
+
+from synapse import server
+
+
+@pytest.fixture
+def fallback_ctx(storage_paths, monkeypatch):
+    """在临时存储上重建后备应用上下文，并清空存储信息缓存"""
+    monkeypatch.setattr(server, "_fallback_ctx", None)
+    monkeypatch.setattr(server, "_storage_info_cache", None)
+    ctx = server._get_fallback_ctx()
+    assert ctx.storage_paths.get_data_dir() == storage_paths.get_data_dir()
+    return ctx
+
+
+def test_fallback_ctx_shares_storage_initializer(fallback_ctx):
+    assert server._get_fallback_ctx() is fallback_ctx
+    assert fallback_ctx.storage_initializer.storage_paths is fallback_ctx.storage_paths
+
+
+@pytest.mark.asyncio
+async def test_storage_info_cached_until_save(fallback_ctx):
+    first = await server.get_storage_info()
+    assert first["total_conversations"] == 0
+    assert await server.get_storage_info() is first
+    
+    result = await server.save_conversation(
+        title="缓存失效", ai_summary="保存后存储信息应重新统计", check_duplicates=False
+    )
+    assert result["success"]
+    
+    second = await server.get_storage_info()
+    assert second is not first
+    assert second["total_conversations"] == 1
+
+
+def test_fast_iso_matches_datetime_isoformat():
+    from datetime import datetime
+    
+    for t in (0.5, 1_700_000_000.123456, 1_700_000_000.999999, 1_700_000_001.0):
+        assert server._fast_iso(t) == datetime.fromtimestamp(t).isoformat(timespec="microseconds")
+
+
+@pytest.mark.asyncio
+async def test_lifespan_flushes_file_managers_on_shutdown(storage_paths, monkeypatch):
+    flushed = []
+    monkeypatch.setattr(server.FileManager, "flush", lambda self: flushed.append(self))
+    
+    async with server.app_lifespan(server.mcp) as app_ctx:
+        managers = {
+            id(app_ctx.file_manager),
+            id(app_ctx.save_conversation_tool.file_manager),
+            id(app_ctx.extract_solutions_tool.file_manager),
+        }
+        # 其他测试遗留的后台同步线程也会调用flush，只看本生命周期创建的实例
+        assert not managers & {id(manager) for manager in flushed}
+    
+    assert managers <= {id(manager) for manager in flushed}